@@ -87,4 +87,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional: installed with the "speed" extra
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
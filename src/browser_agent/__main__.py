@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import argparse
 import os
+import shutil
 import subprocess
 import sys
 import time
@@ -34,11 +35,11 @@ def launch_chrome(*, headless: bool = False, remote_debugging_port: int = 9222)
         "chromium-browser",  # if in PATH
     ]
     
-    chrome_executable = None
-    for path in chrome_paths:
-        if os.path.exists(path) or subprocess.run(["which", path], capture_output=True).returncode == 0:
-            chrome_executable = path
-            break
+    # shutil.which searches PATH in-process instead of spawning `which` per candidate
+    chrome_executable = next(
+        (path for path in chrome_paths if os.path.exists(path) or shutil.which(path)),
+        None,
+    )
     
     if not chrome_executable:
         print("❌ Chrome/Chromium not found. Please install Chrome or Chromium:")
@@ -17,6 +17,8 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+import httpx
+
 from browser_agent.cdp.client import CDPClient, get_page_ws_url
 from browser_agent.cdp.dom import get_dom
 from browser_agent.utils.merger import BrowserDataMerger, EnhancedNode
@@ -96,45 +98,49 @@ class Browser:
         Attempts to connect to an existing Chrome instance first.
         If none is found, launches a new Chrome process.
         """
-        try:
-            # Try to connect to existing Chrome
-            ws_url = await get_page_ws_url(
-                host=self.config.host,
-                port=self.config.port,
-            )
-            logger.info(f"Connected to existing Chrome at {self.config.host}:{self.config.port}")
-        except CDPConnectionError:
-            # Launch Chrome if not running
-            logger.info("No Chrome found, launching new instance...")
-            await self._launch_chrome()
-            
-            # Wait for Chrome to start and retry connection
-            for attempt in range(10):
-                # Check if process is still alive (fail fast if Chrome crashed)
-                if self._chrome_process and self._chrome_process.poll() is not None:
-                    exit_code = self._chrome_process.returncode
-                    self._chrome_process = None
-                    self._launched_chrome = False
-                    raise CDPConnectionError(
-                        f"Chrome process exited unexpectedly with code {exit_code}",
-                        method="Browser.start"
-                    )
+        # One HTTP client (and connection pool) for the initial probe and all retries
+        async with httpx.AsyncClient() as http_client:
+            try:
+                # Try to connect to existing Chrome
+                ws_url = await get_page_ws_url(
+                    host=self.config.host,
+                    port=self.config.port,
+                    http_client=http_client,
+                )
+                logger.info(f"Connected to existing Chrome at {self.config.host}:{self.config.port}")
+            except CDPConnectionError:
+                # Launch Chrome if not running
+                logger.info("No Chrome found, launching new instance...")
+                await self._launch_chrome()
                 
-                await asyncio.sleep(0.5)
-                try:
-                    ws_url = await get_page_ws_url(
-                        host=self.config.host,
-                        port=self.config.port,
-                    )
-                    break
-                except CDPConnectionError:
-                    if attempt == 9:
-                        # Cleanup on failure (P0-7)
-                        await self._cleanup_chrome_process()
+                # Wait for Chrome to start and retry connection
+                for attempt in range(10):
+                    # Check if process is still alive (fail fast if Chrome crashed)
+                    if self._chrome_process and self._chrome_process.poll() is not None:
+                        exit_code = self._chrome_process.returncode
+                        self._chrome_process = None
+                        self._launched_chrome = False
                         raise CDPConnectionError(
-                            f"Chrome failed to start after 5 seconds",
+                            f"Chrome process exited unexpectedly with code {exit_code}",
                             method="Browser.start"
                         )
+                    
+                    await asyncio.sleep(0.5)
+                    try:
+                        ws_url = await get_page_ws_url(
+                            host=self.config.host,
+                            port=self.config.port,
+                            http_client=http_client,
+                        )
+                        break
+                    except CDPConnectionError:
+                        if attempt == 9:
+                            # Cleanup on failure (P0-7)
+                            await self._cleanup_chrome_process()
+                            raise CDPConnectionError(
+                                f"Chrome failed to start after 5 seconds",
+                                method="Browser.start"
+                            )
         
         # Create and connect CDP client
         self._client = CDPClient(ws_url, debug=self.config.debug)
@@ -365,9 +371,8 @@ class Browser:
                 )
             return None
         
-        url, title, screenshot = await asyncio.gather(
-            client.get_current_url(),
-            client.get_page_title(),
+        (url, title), screenshot = await asyncio.gather(
+            client.get_location_and_title(),
             get_screenshot_or_none(),
         )
         
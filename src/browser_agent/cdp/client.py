@@ -2,9 +2,10 @@
 CDP Client - Chrome DevTools Protocol WebSocket client for browser automation.
 """
 import asyncio
+import itertools
 import json
 import logging
-from typing import Dict, List, Optional, Set, cast, Callable, Any
+from typing import Dict, List, Optional, Set, Tuple, cast, Callable, Any
 
 
 import httpx
@@ -22,8 +23,28 @@ from browser_agent.core.errors import (
     CDPTargetError,
 )
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, installed via the "speed" extra
+    orjson = None
+
 logger = logging.getLogger("browser_agent")
 
+# CDP frames are (de)serialized on every command and event, so use orjson when
+# available. Both variants work on UTF-8 bytes, which websockets can send as a
+# text frame and hand back undecoded from recv().
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    _json_loads = json.loads
+
+# DOMSnapshot responses on heavy pages exceed websockets' 1 MiB default limit
+MAX_FRAME_BYTES = 64 << 20
+
 
 def setup_logging(level: int = logging.INFO, debug: bool = False):
     """Configure logging for the browser agent."""
@@ -43,21 +64,32 @@ def setup_logging(level: int = logging.INFO, debug: bool = False):
         logger.addHandler(handler)
 
 
-async def get_page_ws_url(host="localhost", port=9222):
-    """Get the WebSocket URL for the first page target."""
+async def get_page_ws_url(host="localhost", port=9222, http_client: Optional[httpx.AsyncClient] = None):
+    """
+    Get the WebSocket URL for the first page target.
+    
+    Args:
+        host: Chrome debugging host.
+        port: Chrome debugging port.
+        http_client: Optional client to reuse across calls (e.g. while polling
+            for Chrome to come up). A temporary client is used if omitted.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"http://{host}:{port}/json")
-            targets = response.json()
-            for target in targets:
-                if target.get("type") == "page":
-                    ws_url = target["webSocketDebuggerUrl"]
-                    logger.debug(f"Found page target, ws_url={ws_url}")
-                    return ws_url
-            raise CDPTargetError(
-                f"No page target found at {host}:{port}",
-                method="get_page_ws_url"
-            )
+        if http_client is None:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"http://{host}:{port}/json")
+        else:
+            response = await http_client.get(f"http://{host}:{port}/json")
+        targets = _json_loads(response.content)
+        for target in targets:
+            if target.get("type") == "page":
+                ws_url = target["webSocketDebuggerUrl"]
+                logger.debug(f"Found page target, ws_url={ws_url}")
+                return ws_url
+        raise CDPTargetError(
+            f"No page target found at {host}:{port}",
+            method="get_page_ws_url"
+        )
     except httpx.RequestError as e:
         raise CDPConnectionError(
             f"Failed to connect to Chrome at {host}:{port}",
@@ -70,8 +102,10 @@ class CDPClient:
     
     def __init__(self, ws_url: str, debug: bool = False):
         self.ws_url = ws_url
-        self.message_id = 1
+        self._message_ids = itertools.count(1)
         self.pending_message: Dict[int, asyncio.Future] = {}
+        # Methods of send_oneway() commands still awaiting their response, by id
+        self._oneway_methods: Dict[int, str] = {}
         self.ws = None
         self._listen_task: Optional[asyncio.Task] = None
         self.registry = SessionManager()
@@ -80,6 +114,15 @@ class CDPClient:
         self._frame_last_update: Dict[str, float] = {}
         self._lifecycle_enabled_sessions: Set[str] = set()
         self._main_frames: Dict[str, str] = {}
+        # One Event per active wait_for_load call, set by load/network events so each
+        # waiter re-checks without polling; per-waiter so one waiter's clear() can't eat another's wakeup
+        self._load_wakeups: Dict[str, Set[asyncio.Event]] = {}
+        # Sessions whose main frame fired Page.loadEventFired since the wait began
+        self._load_event_seen: Set[str] = set()
+        # Page.getNavigationHistory result per session, dropped on main-frame navigation
+        # and after every history step
+        self._nav_history: Dict[str, Dict[str, Any]] = {}
+        self._event_handlers = self._build_event_handlers()
         self.debug = debug
         self._recovery_in_progress = False
         self._retry_config = {
@@ -299,6 +342,12 @@ class CDPClient:
                 return False
         return True
 
+    def _wake_load_waiter(self, session_id: Optional[str]):
+        wakeups = self._load_wakeups.get(session_id) if session_id else None
+        if wakeups:
+            for wakeup in wakeups:
+                wakeup.set()
+
     def _is_network_idle(self, session_id: str, idle_threshold: float, now: float) -> bool:
         state = self._network_activity.get(session_id)
         if not state:
@@ -326,12 +375,8 @@ class CDPClient:
         state["last_activity"] = self._now()
 
     async def _prepare_for_load_wait(self, session_id: str):
-        session_id = await self._ensure_session_active(session_id)
-        
-        if not self.registry.is_domain_enabled(session_id, "Page"):
-            await self.enable_domains(["Page"], session_id)
-        if not self.registry.is_domain_enabled(session_id, "Network"):
-            await self.enable_domains(["Network"], session_id)
+        # session_id has already been verified by wait_for_load
+        await self.enable_domains(["Page", "Network"], session_id)
         if session_id not in self._lifecycle_enabled_sessions:
             try:
                 await self.send("Page.setLifecycleEventsEnabled", {"enabled": True}, session_id=session_id, use_retry=False)
@@ -339,6 +384,7 @@ class CDPClient:
                 pass
             else:
                 self._lifecycle_enabled_sessions.add(session_id)
+        self._load_event_seen.discard(session_id)
         state = self._get_network_state(session_id)
         inflight = cast(Set[str], state["inflight"])
         inflight.clear()
@@ -363,7 +409,11 @@ class CDPClient:
         logger.info(f"Connecting to Chrome via WebSocket: {self.ws_url}")
         
         try:
-            self.ws = await connect(self.ws_url)
+            self.ws = await connect(
+                self.ws_url,
+                max_size=MAX_FRAME_BYTES,
+                compression=None,
+            )
             logger.info("WebSocket connection established")
         except Exception as e:
             logger.error(f"Failed to establish WebSocket connection: {e}")
@@ -425,18 +475,26 @@ class CDPClient:
                 f"Failed to complete connection setup: {e}",
                 method="connect"
             ) from e
+    
     async def enable_domains(self, domains, session_id: Optional[str] = None):
         """Enable CDP domains for a session."""
         session_id = await self._ensure_session_active(session_id)
         
-        for domain in domains:
-            if not self.registry.is_domain_enabled(session_id, domain):
-                await self.send(f"{domain}.enable", {}, session_id=session_id, use_retry=False)
-                self.registry.mark_domain_enabled(session_id, domain)
-                logger.debug(
-                    f"Enabled domain: {domain}",
-                    extra={"session_id": session_id, "domain": domain}
-                )
+        pending = [domain for domain in domains if not self.registry.is_domain_enabled(session_id, domain)]
+        if not pending:
+            return
+        
+        # Independent enables are pipelined; responses are matched back by id
+        await asyncio.gather(*(
+            self.send(f"{domain}.enable", {}, session_id=session_id, use_retry=False)
+            for domain in pending
+        ))
+        for domain in pending:
+            self.registry.mark_domain_enabled(session_id, domain)
+            logger.debug(
+                f"Enabled domain: {domain}",
+                extra={"session_id": session_id, "domain": domain}
+            )
     
     async def attach_to_target(self, target_id):
         """Attach to a target and return the session ID."""
@@ -494,8 +552,7 @@ class CDPClient:
         else:
             session_id = None  # Explicitly no session for browser-level commands
         
-        self.message_id += 1
-        msg_id = self.message_id
+        msg_id = next(self._message_ids)
         future = asyncio.Future()
         
         self.pending_message[msg_id] = future
@@ -525,7 +582,7 @@ class CDPClient:
                     method=method,
                 )
             
-            await self.ws.send(json.dumps(message))
+            await self.ws.send(_json_dumps(message), text=True)
             result = await future
             
             duration = self._now() - start_time
@@ -578,10 +635,66 @@ class CDPClient:
                 method=method,
             ) from e
     
+    async def send_oneway(self, method, params=None, session_id: Optional[str] = None) -> None:
+        """
+        Send a CDP command without waiting for its response.
+
+        Meant for input events whose acknowledgement carries no data. CDP handles
+        commands on a session in order, so awaiting a later send() on the same
+        session still guarantees that these were processed, but it does not
+        report their errors: Chrome rejecting a one-way command is only logged
+        as a warning naming the method.
+        """
+        if not self._is_browser_level_method(method):
+            session_id = await self._ensure_session_active(session_id)
+        else:
+            session_id = None
+        
+        if not self.ws:
+            raise CDPConnectionError(
+                "WebSocket connection not established",
+                session_id=session_id,
+                method=method,
+            )
+        
+        msg_id = next(self._message_ids)
+        message = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id is not None:
+            message["sessionId"] = session_id
+        
+        self._oneway_methods[msg_id] = method
+        try:
+            await self.ws.send(_json_dumps(message), text=True)
+        except websockets.exceptions.ConnectionClosed as e:
+            self._oneway_methods.pop(msg_id, None)
+            raise CDPConnectionError(
+                f"CDP command {method} failed: {e}",
+                session_id=session_id,
+                method=method,
+            ) from e
+    
+    def _build_event_handlers(self) -> Dict[str, Callable[[Dict[str, Any], Optional[str]], None]]:
+        """Map CDP event names to their bookkeeping handlers."""
+        return {
+            "Target.attachedToTarget": self._on_attached_to_target,
+            "Target.detachedFromTarget": self._on_detached_from_target,
+            "Target.targetCreated": self._on_target_created,
+            "Target.targetDestroyed": self._on_target_destroyed,
+            "Page.frameAttached": self._on_frame_attached,
+            "Page.frameNavigated": self._on_frame_navigated,
+            "Page.navigatedWithinDocument": self._on_navigated_within_document,
+            "Page.frameDetached": self._on_frame_detached,
+            "Page.frameStartedLoading": self._on_frame_started_loading,
+            "Page.frameStoppedLoading": self._on_frame_stopped_loading,
+            "Page.loadEventFired": self._on_load_event_fired,
+            "Network.requestWillBeSent": self._on_request_will_be_sent,
+            "Network.loadingFinished": self._on_loading_finished,
+            "Network.loadingFailed": self._on_loading_finished,
+        }
+
     def _handle_event(self, data: dict):
         """Handle CDP events."""
         method = data.get("method", "")
-        params = data.get("params", {})
         session_id = data.get("sessionId")  # Events from sessions include this
         
         if self.debug:
@@ -590,38 +703,17 @@ class CDPClient:
                 extra={"method": method, "session_id": session_id}
             )
         
-        if method == "Target.attachedToTarget":
-            session_id = params.get("sessionId")
-            target_info = params.get("targetInfo", {})
-            target_id = target_info.get("targetId")
-            target_url = target_info.get("url", "")
-            
-            if session_id and target_id:
-                self.registry.add_target(
-                    target_id=target_id,
-                    type=target_info.get("type", "unknown"),
-                    url=target_url,
-                    title=target_info.get("title", ""),
-                    browser_context_id=target_info.get("browserContextId")
-                )
-                self.registry.add_session(session_id, target_id)
-                
-                self._map_target_to_frames(target_id, target_url, session_id)
+        handler = self._event_handlers.get(method)
+        if handler is not None:
+            handler(data.get("params", {}), session_id)
+
+    def _on_attached_to_target(self, params: Dict[str, Any], session_id: Optional[str]):
+        session_id = params.get("sessionId")
+        target_info = params.get("targetInfo", {})
+        target_id = target_info.get("targetId")
+        target_url = target_info.get("url", "")
         
-        elif method == "Target.detachedFromTarget":
-            session_id = params.get("sessionId")
-            if session_id:
-                logger.info(
-                    f"Target detached from session",
-                    extra={"session_id": session_id}
-                )
-                self.registry.mark_session_disconnected(session_id)
-        
-        elif method == "Target.targetCreated":
-            target_info = params.get("targetInfo", {})
-            target_id = target_info.get("targetId")
-            target_url = target_info.get("url", "")
-            
+        if session_id and target_id:
             self.registry.add_target(
                 target_id=target_id,
                 type=target_info.get("type", "unknown"),
@@ -629,118 +721,153 @@ class CDPClient:
                 title=target_info.get("title", ""),
                 browser_context_id=target_info.get("browserContextId")
             )
+            self.registry.add_session(session_id, target_id)
             
-            if target_info.get("type") == "page" and target_info.get("url"):
-                self._map_target_to_frames(target_id, target_url, None)
-        
-        elif method == "Target.targetDestroyed":
-            target_id = params.get("targetId")
-            if target_id:
-                target = self.registry.get_target(target_id)
-                if target and target.session_id:
-                    logger.info(
-                        f"Target destroyed",
-                        extra={"target_id": target_id, "session_id": target.session_id}
-                    )
-                    self.registry.mark_session_disconnected(target.session_id)
-        elif method == "Page.frameAttached":
-            frame_id = params.get("frameId")
-            parent_frame_id = params.get("parentFrameId")
-            
-            if not frame_id:
-                return
-            
-            parent_frame = self.registry.get_frame(parent_frame_id) if parent_frame_id else None
-            
-            if parent_frame:
-                target_id = parent_frame.target_id
-                frame_session_id = parent_frame.session_id or session_id
-            else:
-                target_id = None
-                frame_session_id = session_id or self.registry.get_active_session()
-            
-            self.registry.add_frame(
-                frame_id=frame_id,
-                parent_frame_id=parent_frame_id,
-                url="",
-                origin="",
-                target_id=target_id,
-                session_id=frame_session_id
+            self._map_target_to_frames(target_id, target_url, session_id)
+
+    def _on_detached_from_target(self, params: Dict[str, Any], session_id: Optional[str]):
+        session_id = params.get("sessionId")
+        if session_id:
+            logger.info(
+                f"Target detached from session",
+                extra={"session_id": session_id}
             )
-            
-            self._mark_frame_loading(frame_id)
+            self.registry.mark_session_disconnected(session_id)
+            self._nav_history.pop(session_id, None)
+            self._load_event_seen.discard(session_id)
+            self._wake_load_waiter(session_id)
+
+    def _on_target_created(self, params: Dict[str, Any], session_id: Optional[str]):
+        target_info = params.get("targetInfo", {})
+        target_id = target_info.get("targetId")
+        target_url = target_info.get("url", "")
         
-        elif method == "Page.frameNavigated":
-            frame_data = params.get("frame")
-            if not frame_data:
-                return
-            
-            frame_id = frame_data.get("id")
-            url = frame_data.get("url", "")
-            origin = frame_data.get("securityOrigin", "")
-            
-            if not frame_id:
-                return
-            
-            if session_id and not frame_data.get("parentId"):
-                self._main_frames[session_id] = frame_id
-            self._mark_frame_loading(frame_id)
-            
-            frame = self.registry.get_frame(frame_id)
-            if frame:
-                frame.url = url
-                frame.origin = origin
-                
-                if frame.parent_frame_id:
-                    parent = self.registry.get_frame(frame.parent_frame_id)
-                    if parent and origin != parent.origin and origin:
-                        target = self.registry.find_target_by_origin(origin)
-                        if target and target.session_id:
-                            frame.target_id = target.target_id
-                            frame.session_id = target.session_id
-            else:
-                parent_frame_id = None
-                frame_session_id = session_id or self.registry.get_active_session()
-                session_info = self.registry.get_session(frame_session_id) if frame_session_id else None
-                target_id = session_info.target_id if session_info else None
-                
-                self.registry.add_frame(
-                    frame_id=frame_id,
-                    parent_frame_id=parent_frame_id,
-                    url=url,
-                    origin=origin,
-                    target_id=target_id,
-                    session_id=frame_session_id
+        self.registry.add_target(
+            target_id=target_id,
+            type=target_info.get("type", "unknown"),
+            url=target_url,
+            title=target_info.get("title", ""),
+            browser_context_id=target_info.get("browserContextId")
+        )
+        
+        if target_info.get("type") == "page" and target_info.get("url"):
+            self._map_target_to_frames(target_id, target_url, None)
+
+    def _on_target_destroyed(self, params: Dict[str, Any], session_id: Optional[str]):
+        target_id = params.get("targetId")
+        if target_id:
+            target = self.registry.get_target(target_id)
+            if target and target.session_id:
+                logger.info(
+                    f"Target destroyed",
+                    extra={"target_id": target_id, "session_id": target.session_id}
                 )
+                self.registry.mark_session_disconnected(target.session_id)
+
+    def _on_frame_attached(self, params: Dict[str, Any], session_id: Optional[str]):
+        frame_id = params.get("frameId")
+        parent_frame_id = params.get("parentFrameId")
+        
+        if not frame_id:
+            return
         
-        elif method == "Page.frameDetached":
-            frame_id = params.get("frameId")
-            if frame_id:
-                self._clear_frame_tracking(frame_id)
-                self.registry.remove_frame(frame_id)
+        parent_frame = self.registry.get_frame(parent_frame_id) if parent_frame_id else None
         
-        elif method == "Page.frameStartedLoading":
-            frame_id = params.get("frameId")
-            self._mark_frame_loading(frame_id)
+        if parent_frame:
+            target_id = parent_frame.target_id
+            frame_session_id = parent_frame.session_id or session_id
+        else:
+            target_id = None
+            frame_session_id = session_id or self.registry.get_active_session()
         
-        elif method == "Page.frameStoppedLoading":
-            frame_id = params.get("frameId")
-            self._mark_frame_loaded(frame_id)
+        self.registry.add_frame(
+            frame_id=frame_id,
+            parent_frame_id=parent_frame_id,
+            url="",
+            origin="",
+            target_id=target_id,
+            session_id=frame_session_id
+        )
         
-        elif method == "Page.loadEventFired":
-            if session_id and session_id in self._main_frames:
-                self._mark_frame_loaded(self._main_frames[session_id])
+        self._mark_frame_loading(frame_id)
+
+    def _on_frame_navigated(self, params: Dict[str, Any], session_id: Optional[str]):
+        frame_data = params.get("frame")
+        if not frame_data:
+            return
         
-        elif method == "Network.requestWillBeSent":
-            if session_id:
-                self._handle_request_will_be_sent(session_id, params)
+        frame_id = frame_data.get("id")
+        url = frame_data.get("url", "")
+        origin = frame_data.get("securityOrigin", "")
         
-        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
-            if session_id:
-                self._handle_request_finished(session_id, params)
+        if not frame_id:
+            return
+        
+        if session_id and not frame_data.get("parentId"):
+            self._main_frames[session_id] = frame_id
+            self._nav_history.pop(session_id, None)
+        self._mark_frame_loading(frame_id)
         
-        elif method.startswith("Page."):
-            pass
+        frame = self.registry.get_frame(frame_id)
+        if frame:
+            frame.url = url
+            frame.origin = origin
+            
+            if frame.parent_frame_id:
+                parent = self.registry.get_frame(frame.parent_frame_id)
+                if parent and origin != parent.origin and origin:
+                    target = self.registry.find_target_by_origin(origin)
+                    if target and target.session_id:
+                        frame.target_id = target.target_id
+                        frame.session_id = target.session_id
+        else:
+            parent_frame_id = None
+            frame_session_id = session_id or self.registry.get_active_session()
+            session_info = self.registry.get_session(frame_session_id) if frame_session_id else None
+            target_id = session_info.target_id if session_info else None
+            
+            self.registry.add_frame(
+                frame_id=frame_id,
+                parent_frame_id=parent_frame_id,
+                url=url,
+                origin=origin,
+                target_id=target_id,
+                session_id=frame_session_id
+            )
+
+    def _on_navigated_within_document(self, params: Dict[str, Any], session_id: Optional[str]):
+        # Same-document navigations (pushState, anchors) also add history entries
+        if session_id:
+            self._nav_history.pop(session_id, None)
+
+    def _on_frame_detached(self, params: Dict[str, Any], session_id: Optional[str]):
+        frame_id = params.get("frameId")
+        if frame_id:
+            self._clear_frame_tracking(frame_id)
+            self.registry.remove_frame(frame_id)
+
+    def _on_frame_started_loading(self, params: Dict[str, Any], session_id: Optional[str]):
+        self._mark_frame_loading(params.get("frameId"))
+
+    def _on_frame_stopped_loading(self, params: Dict[str, Any], session_id: Optional[str]):
+        self._mark_frame_loaded(params.get("frameId"))
+        self._wake_load_waiter(session_id)
+
+    def _on_load_event_fired(self, params: Dict[str, Any], session_id: Optional[str]):
+        if session_id:
+            self._load_event_seen.add(session_id)
+            if session_id in self._main_frames:
+                self._mark_frame_loaded(self._main_frames[session_id])
+            self._wake_load_waiter(session_id)
+
+    def _on_request_will_be_sent(self, params: Dict[str, Any], session_id: Optional[str]):
+        if session_id:
+            self._handle_request_will_be_sent(session_id, params)
+
+    def _on_loading_finished(self, params: Dict[str, Any], session_id: Optional[str]):
+        if session_id:
+            self._handle_request_finished(session_id, params)
+            self._wake_load_waiter(session_id)
     
     async def listen(self):
         """Listen for CDP responses and events."""
@@ -748,8 +875,8 @@ class CDPClient:
             while True:
                 if not self.ws:
                     break
-                raw = await self.ws.recv()
-                data = json.loads(raw)
+                raw = await self.ws.recv(decode=False)
+                data = _json_loads(raw)
                 
                 if "id" in data and data["id"] in self.pending_message:
                     future = self.pending_message.pop(data["id"])
@@ -759,7 +886,9 @@ class CDPClient:
                             error_code = error_data.get("code")
                             error_message = error_data.get("message", "Unknown CDP error")
                             
-                            logger.error(
+                            # The awaiting command logs the failure; keep the
+                            # dispatch loop's own record at debug level
+                            logger.debug(
                                 f"CDP protocol error: {error_message}",
                                 extra={
                                     "error_code": error_code,
@@ -778,28 +907,51 @@ class CDPClient:
                             future.set_result(data["result"])
                 elif "method" in data:
                     self._handle_event(data)
+                elif "id" in data:
+                    # Response to a send_oneway() command nobody is waiting on
+                    method = self._oneway_methods.pop(data["id"], None)
+                    if "error" in data:
+                        logger.warning(
+                            f"CDP error for one-way command {method}: {data['error'].get('message')}",
+                            extra={
+                                "method": method,
+                                "message_id": data["id"],
+                                "error_data": data["error"],
+                            },
+                        )
                     
         except websockets.exceptions.ConnectionClosed as e:
             logger.error("WebSocket connection closed", exc_info=True)
-            for future in self.pending_message.values():
-                if not future.done():
-                    future.set_exception(CDPConnectionError(
-                        "WebSocket connection closed",
-                        method="listen"
-                    ))
-            self.pending_message.clear()
+            self._invalidate_pending(CDPConnectionError(
+                "WebSocket connection closed",
+                method="listen"
+            ))
         except Exception as e:
             logger.error(f"Error in listen loop: {e}", exc_info=True)
-            for future in self.pending_message.values():
-                if not future.done():
-                    if isinstance(e, BrowserAgentError):
-                        future.set_exception(e)
-                    else:
-                        future.set_exception(CDPConnectionError(
-                            f"Unexpected error in listen loop: {e}",
-                            method="listen"
-                        ))
-            self.pending_message.clear()
+            if isinstance(e, BrowserAgentError):
+                self._invalidate_pending(e)
+            else:
+                self._invalidate_pending(CDPConnectionError(
+                    f"Unexpected error in listen loop: {e}",
+                    method="listen"
+                ))
+    
+    def _invalidate_pending(self, error: BrowserAgentError):
+        """
+        Fail every in-flight command and start a fresh pending map.
+        
+        The pending map is swapped out before any future is touched, so commands
+        issued while the old futures are being failed register in the new map and
+        are never cleared by this teardown. Message ids keep increasing, so late
+        responses for the old ids simply find no entry.
+        """
+        stale = self.pending_message
+        self.pending_message = {}
+        self._oneway_methods = {}
+        for future in stale.values():
+            if not future.done():
+                future.set_exception(error)
+    
     async def get_frame_tree(self, session_id: Optional[str] = None):
         """
         Collect frame tree from a session and store frames in registry.
@@ -831,7 +983,10 @@ class CDPClient:
     def _parse_frame_tree(self, frame_tree_node: dict, parent_frame_id: Optional[str], 
                          target_id: Optional[str], session_id: str):
         """
-        Recursively parse a frame tree node and its children.
+        Parse a frame tree node and its children into the registry.
+        
+        Walks the tree with an explicit stack so registry lookups can be bound
+        to locals once for the whole tree.
         
         frame_tree_node structure:
         {
@@ -844,61 +999,60 @@ class CDPClient:
           "childFrames": [...]
         }
         """
-        frame_data = frame_tree_node.get("frame", {})
-        if not frame_data:
-            return
+        registry = self.registry
+        get_frame = registry.get_frame
+        add_frame = registry.add_frame
+        find_cross_origin_target = self._find_target_for_cross_origin_frame
         
-        frame_id = frame_data.get("id")
-        if not frame_id:
-            return
-        
-        url = frame_data.get("url", "")
-        origin = frame_data.get("securityOrigin", "")
+        # Stack holds tuples of (frame_tree_node, parent_frame_id, target_id, session_id)
+        stack = [(frame_tree_node, parent_frame_id, target_id, session_id)]
         
-        child_target_id = target_id
-        child_session_id = session_id
-        
-        if parent_frame_id:
-            parent_frame = self.registry.get_frame(parent_frame_id)
-            if parent_frame:
-                parent_origin = parent_frame.origin
-                is_cross_origin = origin != parent_origin and origin != "" and parent_origin != ""
-                
-                if is_cross_origin:
-                    target = self._find_target_for_cross_origin_frame(url, origin)
-                    if target and target.session_id:
-                        child_target_id = target.target_id
-                        child_session_id = target.session_id
-        
-        self.registry.add_frame(
-            frame_id=frame_id,
-            parent_frame_id=parent_frame_id,
-            url=url,
-            origin=origin,
-            target_id=child_target_id,
-            session_id=child_session_id
-        )
-        
-        child_frames = frame_tree_node.get("childFrames", [])
-        for child_frame_tree in child_frames:
-            self._parse_frame_tree(
-                child_frame_tree,
-                parent_frame_id=frame_id,
+        while stack:
+            node, parent_id, node_target_id, node_session_id = stack.pop()
+            
+            frame_data = node.get("frame", {})
+            if not frame_data:
+                continue
+            
+            frame_id = frame_data.get("id")
+            if not frame_id:
+                continue
+            
+            url = frame_data.get("url", "")
+            origin = frame_data.get("securityOrigin", "")
+            
+            child_target_id = node_target_id
+            child_session_id = node_session_id
+            
+            if parent_id:
+                parent_frame = get_frame(parent_id)
+                if parent_frame:
+                    parent_origin = parent_frame.origin
+                    is_cross_origin = origin != parent_origin and origin != "" and parent_origin != ""
+                    
+                    if is_cross_origin:
+                        target = find_cross_origin_target(url, origin)
+                        if target and target.session_id:
+                            child_target_id = target.target_id
+                            child_session_id = target.session_id
+            
+            add_frame(
+                frame_id=frame_id,
+                parent_frame_id=parent_id,
+                url=url,
+                origin=origin,
                 target_id=child_target_id,
                 session_id=child_session_id
             )
+            
+            # Push children in reverse so they are registered in document order
+            for child_frame_tree in reversed(node.get("childFrames", [])):
+                stack.append((child_frame_tree, frame_id, child_target_id, child_session_id))
     
     def _find_target_for_cross_origin_frame(self, url: str, origin: str):
         """Find the target that corresponds to a cross-origin frame."""
-        target = self.registry.find_target_by_url(url)
-        if target:
-            return target
-        
-        target = self.registry.find_target_by_origin(origin)
-        if target:
-            return target
-        
-        return None
+        registry = self.registry
+        return registry.find_target_by_url(url) or registry.find_target_by_origin(origin)
     
     def _map_target_to_frames(self, target_id: str, target_url: str, session_id: Optional[str]):
         """
@@ -911,22 +1065,32 @@ class CDPClient:
         if not target_url:
             return
         
-        target_origin = self.registry._extract_origin_from_url(target_url)
+        registry = self.registry
+        update_mapping = registry.update_frame_target_mapping
+        target_origin = registry._extract_origin_from_url(target_url)
         
-        for frame_id, frame in self.registry.frames.items():
-            if frame.target_id is None or frame.target_id != target_id:
+        for frame_id, frame in registry.frames.items():
+            if frame.target_id == target_id:
+                continue
+            
+            # Origin equality is a single hash compare; URL prefix matching is only
+            # needed for frames that have not reported a security origin yet.
+            frame_origin = frame.origin
+            if frame_origin:
+                frame_matches = frame_origin == target_origin or frame.url == target_url
+            else:
+                frame_url = frame.url
                 frame_matches = (
-                    frame.url == target_url or
-                    target_url.startswith(frame.url) or
-                    frame.url.startswith(target_url) or
-                    (frame.origin and frame.origin == target_origin)
+                    frame_url == target_url or
+                    target_url.startswith(frame_url) or
+                    frame_url.startswith(target_url)
                 )
-                
-                if frame_matches:
-                    if session_id:
-                        self.registry.update_frame_target_mapping(frame_id, target_id, session_id)
-                    else:
-                        frame.target_id = target_id
+            
+            if frame_matches:
+                if session_id:
+                    update_mapping(frame_id, target_id, session_id)
+                else:
+                    frame.target_id = target_id
     async def wait_for_load(
         self,
         session_id: Optional[str] = None,
@@ -935,7 +1099,22 @@ class CDPClient:
         check_interval: float = 0.1,
     ):
         session_id = await self._ensure_session_active(session_id)
-        
+        await self._wait_for_load_inner(
+            session_id,
+            timeout=timeout,
+            network_idle_threshold=network_idle_threshold,
+            check_interval=check_interval,
+        )
+
+    async def _wait_for_load_inner(
+        self,
+        session_id: str,
+        *,
+        timeout: float = 15.0,
+        network_idle_threshold: float = 0.5,
+        check_interval: float = 0.1,
+    ):
+        """Load wait for callers that already resolved and verified the session."""
         logger.info(
             f"Waiting for page load",
             extra={"session_id": session_id, "timeout": timeout}
@@ -946,51 +1125,69 @@ class CDPClient:
         loop = asyncio.get_running_loop()
         deadline = loop.time() + timeout
         ready_state_complete = False
+        wakeup = asyncio.Event()
+        waiters = self._load_wakeups.setdefault(session_id, set())
+        waiters.add(wakeup)
 
-        while True:
-            now = loop.time()
-            if now >= deadline:
-                state = self._get_network_state(session_id)
-                inflight = len(cast(Set[str], state["inflight"]))
-                pending_frames = list(self._frames_pending_load(session_id))
-                
-                logger.error(
-                    f"Page load timeout after {timeout}s",
-                    extra={
-                        "session_id": session_id,
-                        "timeout": timeout,
-                        "pending_frames": pending_frames,
-                        "inflight_requests": inflight,
-                    }
-                )
-                
-                raise CDPTimeoutError(
-                    f"Page load timed out after {timeout} seconds "
-                    f"(pending_frames={pending_frames}, inflight_requests={inflight})",
-                    timeout=timeout,
-                    session_id=session_id,
-                    method="wait_for_load",
-                    pending_frames=pending_frames,
-                    inflight_requests=inflight,
-                )
+        try:
+            while True:
+                # Events arriving during the checks below set it again and cut the next wait short
+                wakeup.clear()
+                now = loop.time()
+                if now >= deadline:
+                    state = self._get_network_state(session_id)
+                    inflight = len(cast(Set[str], state["inflight"]))
+                    pending_frames = list(self._frames_pending_load(session_id))
+                    
+                    logger.error(
+                        f"Page load timeout after {timeout}s",
+                        extra={
+                            "session_id": session_id,
+                            "timeout": timeout,
+                            "pending_frames": pending_frames,
+                            "inflight_requests": inflight,
+                        }
+                    )
+                    
+                    raise CDPTimeoutError(
+                        f"Page load timed out after {timeout} seconds "
+                        f"(pending_frames={pending_frames}, inflight_requests={inflight})",
+                        timeout=timeout,
+                        session_id=session_id,
+                        method="wait_for_load",
+                        pending_frames=pending_frames,
+                        inflight_requests=inflight,
+                    )
 
-            if not ready_state_complete:
+                if not ready_state_complete and session_id in self._load_event_seen:
+                    # The load event implies readyState "complete"; skip the evaluate round trip
+                    ready_state_complete = True
+                if not ready_state_complete:
+                    try:
+                        ready_state_complete = await self._is_document_ready(session_id)
+                        if ready_state_complete:
+                            logger.debug("Document readyState is complete", extra={"session_id": session_id})
+                    except BrowserAgentError:
+                        ready_state_complete = False
+
+                network_idle = self._is_network_idle(session_id, network_idle_threshold, now)
+                frames_loaded = self._are_frames_loaded(session_id)
+
+                if ready_state_complete and network_idle and frames_loaded:
+                    logger.info("Page load complete", extra={"session_id": session_id})
+                    return
+
+                # Wake on the next load/network event, or after check_interval so the
+                # network idle threshold can elapse
                 try:
-                    ready_state_complete = await self._is_document_ready(session_id)
-                    if ready_state_complete:
-                        logger.debug("Document readyState is complete", extra={"session_id": session_id})
-                except BrowserAgentError:
-                    ready_state_complete = False
-
-            network_idle = self._is_network_idle(session_id, network_idle_threshold, now)
-            frames_loaded = self._are_frames_loaded(session_id)
-
-            if ready_state_complete and network_idle and frames_loaded:
-                logger.info("Page load complete", extra={"session_id": session_id})
-                return
+                    await asyncio.wait_for(wakeup.wait(), timeout=min(check_interval, deadline - now))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            waiters.discard(wakeup)
+            if not waiters and self._load_wakeups.get(session_id) is waiters:
+                del self._load_wakeups[session_id]
 
-            await asyncio.sleep(check_interval)
-            
     async def collect_all_frame_trees(self):
         """
         Collect frame trees from all active sessions.
@@ -998,8 +1195,10 @@ class CDPClient:
         This should be called after page load to discover all frames,
         including cross-origin iframes that have their own sessions.
         """
-        for session_id, session_info in self.registry.sessions.items():
-            if session_info.status == SessionStatus.ACTIVE:
+        # Snapshot the sessions: attach events may add entries while we await below
+        active = SessionStatus.ACTIVE
+        for session_id, session_info in list(self.registry.sessions.items()):
+            if session_info.status == active:
                 try:
                     await self.get_frame_tree(session_id=session_id)
                 except BrowserAgentError as e:
@@ -1048,18 +1247,47 @@ class CDPClient:
         resolved_session_id = session_id or self.registry.get_session_from_frame(node.frame_id)
         resolved_session_id = await self._ensure_session_active(resolved_session_id)
 
+        await self._click_node_inner(
+            node,
+            backend_node_id,
+            session_id=resolved_session_id,
+            button=button,
+            click_count=click_count,
+            move_before_click=move_before_click,
+            scroll_into_view=scroll_into_view,
+            delay_between_events=delay_between_events,
+        )
+
+    async def _click_node_inner(
+        self,
+        node: EnhancedNode,
+        backend_node_id: int,
+        *,
+        session_id: str,
+        button: str = "left",
+        click_count: int = 1,
+        move_before_click: bool = True,
+        scroll_into_view: bool = True,
+        delay_between_events: float = 0.05,
+    ):
+        """
+        Click implementation for callers that already resolved and verified the session.
+
+        Skips the node validation and _ensure_session_active round done by click_node,
+        so composite actions such as type_text only pay for session resolution once.
+        """
         if scroll_into_view:
             try:
                 await self.send(
                     "DOM.scrollIntoViewIfNeeded",
                     {"backendNodeId": backend_node_id},
-                    session_id=resolved_session_id,
+                    session_id=session_id,
                 )
             except BrowserAgentError as exc:
                 logger.debug(
                     "scrollIntoViewIfNeeded failed, continuing with click",
                     extra={
-                        "session_id": resolved_session_id,
+                        "session_id": session_id,
                         "backend_node_id": backend_node_id,
                         "error_type": type(exc).__name__,
                     },
@@ -1071,7 +1299,7 @@ class CDPClient:
             box_model = await self.send(
                 "DOM.getBoxModel",
                 {"backendNodeId": backend_node_id},
-                session_id=resolved_session_id,
+                session_id=session_id,
             )
             content = box_model.get("model", {}).get("content", [])
             if len(content) >= 6:
@@ -1083,14 +1311,16 @@ class CDPClient:
             logger.debug(
                 "DOM.getBoxModel failed, using original click point",
                 extra={
-                    "session_id": resolved_session_id,
+                    "session_id": session_id,
                     "backend_node_id": backend_node_id,
                     "error_type": type(exc).__name__,
                 },
             )
 
+        # Only the final mouseReleased is awaited; the earlier events are pipelined
+        # behind it and are known to be handled once its response arrives.
         if move_before_click:
-            await self.send(
+            await self.send_oneway(
                 "Input.dispatchMouseEvent",
                 {
                     "type": "mouseMoved",
@@ -1098,10 +1328,10 @@ class CDPClient:
                     "y": y_float,
                     "modifiers": 0,
                 },
-                session_id=resolved_session_id,
+                session_id=session_id,
             )
 
-        await self.send(
+        await self.send_oneway(
             "Input.dispatchMouseEvent",
             {
                 "type": "mousePressed",
@@ -1111,7 +1341,7 @@ class CDPClient:
                 "clickCount": click_count,
                 "modifiers": 0,
             },
-            session_id=resolved_session_id,
+            session_id=session_id,
         )
 
         if delay_between_events > 0:
@@ -1127,7 +1357,7 @@ class CDPClient:
                 "clickCount": click_count,
                 "modifiers": 0,
             },
-            session_id=resolved_session_id,
+            session_id=session_id,
         )
 
     async def type_text(
@@ -1165,8 +1395,9 @@ class CDPClient:
         resolved_session_id = await self._ensure_session_active(resolved_session_id)
 
         if click_to_focus:
-            await self.click_node(
+            await self._click_node_inner(
                 node,
+                backend_node_id,
                 button="left",
                 click_count=1,
                 move_before_click=False,
@@ -1175,12 +1406,14 @@ class CDPClient:
                 session_id=resolved_session_id,
             )
 
+        focused = False
         try:
             await self.send(
                 "DOM.focus",
                 {"backendNodeId": backend_node_id},
                 session_id=resolved_session_id,
             )
+            focused = True
         except BrowserAgentError as exc:
             logger.debug(
                 "Failed to focus node before typing",
@@ -1191,69 +1424,129 @@ class CDPClient:
                 },
             )
 
-        object_id: Optional[str] = None
-        try:
-            resolved = await self.send(
-                "DOM.resolveNode",
-                {"backendNodeId": backend_node_id},
-                session_id=resolved_session_id,
-            )
-            object_id = resolved.get("object", {}).get("objectId")
-        except BrowserAgentError as exc:
-            logger.debug(
-                "DOM.resolveNode failed, continuing without objectId",
-                extra={
-                    "session_id": resolved_session_id,
-                    "backend_node_id": backend_node_id,
-                    "error_type": type(exc).__name__,
-                },
-            )
-
-        if clear_existing and object_id:
-            try:
-                await self.send(
-                    "Runtime.callFunctionOn",
-                    {
-                        "objectId": object_id,
-                        "functionDeclaration": """
-                            function() {
-                                if (this instanceof HTMLInputElement || this instanceof HTMLTextAreaElement) {
-                                    this.value = '';
-                                    this.dispatchEvent(new Event('input', { bubbles: true }));
-                                    this.dispatchEvent(new Event('change', { bubbles: true }));
-                                } else {
-                                    this.textContent = '';
-                                }
-                            }
-                        """,
-                        "awaitPromise": False,
-                    },
-                    session_id=resolved_session_id,
-                )
-            except BrowserAgentError as exc:
-                logger.debug(
-                    "Failed to clear existing text before typing",
-                    extra={
-                        "session_id": resolved_session_id,
-                        "backend_node_id": backend_node_id,
-                        "error_type": type(exc).__name__,
-                    },
-                )
+        if clear_existing:
+            cleared = False
+            if focused:
+                # Key events go to whatever has focus, so only use them once the target does
+                try:
+                    await self._clear_focused_field(session_id=resolved_session_id)
+                    cleared = True
+                except BrowserAgentError as exc:
+                    logger.debug(
+                        "Failed to clear focused field with key events, falling back to node clear",
+                        extra={
+                            "session_id": resolved_session_id,
+                            "backend_node_id": backend_node_id,
+                            "error_type": type(exc).__name__,
+                        },
+                    )
+            if not cleared:
+                try:
+                    await self._clear_node_value(backend_node_id, session_id=resolved_session_id)
+                except BrowserAgentError as exc:
+                    logger.debug(
+                        "Failed to clear existing text before typing",
+                        extra={
+                            "session_id": resolved_session_id,
+                            "backend_node_id": backend_node_id,
+                            "error_type": type(exc).__name__,
+                        },
+                    )
 
-        if delay_between_chars > 0:
-            for char in text:
-                await self.send(
+        if delay_between_chars > 0 and text:
+            # Pipeline all but the last character; awaiting the last one confirms the rest
+            for char in text[:-1]:
+                await self.send_oneway(
                     "Input.insertText",
                     {"text": char},
                     session_id=resolved_session_id,
                 )
                 await asyncio.sleep(delay_between_chars)
+            await self.send(
+                "Input.insertText",
+                {"text": text[-1]},
+                session_id=resolved_session_id,
+            )
         else:
             await self.send(
                 "Input.insertText",
                 {"text": text},
                 session_id=resolved_session_id,
-                    )
+            )
+
+    async def _clear_focused_field(self, *, session_id: str) -> None:
+        """
+        Clear the focused editable element with select-all followed by Delete.
+
+        Uses plain key events instead of resolving the node and running a JS
+        function on it, so the page sees the same input events a user would cause.
+        Callers must have focused the target first: the keys go to whatever
+        element currently has focus.
+        """
+        # "selectAll" makes the shortcut platform independent (Ctrl+A vs Cmd+A)
+        await self.send_oneway(
+            "Input.dispatchKeyEvent",
+            {
+                "type": "rawKeyDown",
+                "key": "a",
+                "code": "KeyA",
+                "windowsVirtualKeyCode": 65,
+                "modifiers": 2,
+                "commands": ["selectAll"],
+            },
+            session_id=session_id,
+        )
+        await self.send_oneway(
+            "Input.dispatchKeyEvent",
+            {"type": "keyUp", "key": "a", "code": "KeyA", "windowsVirtualKeyCode": 65, "modifiers": 2},
+            session_id=session_id,
+        )
+        await self.send_oneway(
+            "Input.dispatchKeyEvent",
+            {"type": "rawKeyDown", "key": "Delete", "code": "Delete", "windowsVirtualKeyCode": 46},
+            session_id=session_id,
+        )
+        await self.send(
+            "Input.dispatchKeyEvent",
+            {"type": "keyUp", "key": "Delete", "code": "Delete", "windowsVirtualKeyCode": 46},
+            session_id=session_id,
+        )
+
+    async def _clear_node_value(self, backend_node_id: int, *, session_id: str) -> None:
+        """
+        Clear a specific node's value by resolving it and running a JS function on it.
+
+        Fallback for when the node could not be focused, so key events would
+        land on some other element.
+        """
+        resolved = await self.send(
+            "DOM.resolveNode",
+            {"backendNodeId": backend_node_id},
+            session_id=session_id,
+        )
+        object_id = resolved.get("object", {}).get("objectId")
+        if not object_id:
+            return
+        await self.send(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": """
+                    function() {
+                        if (this instanceof HTMLInputElement || this instanceof HTMLTextAreaElement) {
+                            this.value = '';
+                            this.dispatchEvent(new Event('input', { bubbles: true }));
+                            this.dispatchEvent(new Event('change', { bubbles: true }));
+                        } else {
+                            this.textContent = '';
+                        }
+                    }
+                """,
+                "awaitPromise": False,
+            },
+            session_id=session_id,
+        )
+
     # =========================================================================
     # Screenshot Capture (Task 1.3)
     # =========================================================================
@@ -1363,77 +1656,72 @@ class CDPClient:
     # Navigation Helpers (Task 1.5)
     # =========================================================================
 
-    async def go_back(self, *, session_id: Optional[str] = None) -> bool:
-        """
-        Navigate back in browser history.
+    async def _get_nav_history(self, session_id: str) -> Dict[str, Any]:
+        """Return the navigation history for a session, fetching it only when not cached."""
+        history = self._nav_history.get(session_id)
+        if history is None:
+            history = await self.send(
+                "Page.getNavigationHistory",
+                {},
+                session_id=session_id,
+            )
+            self._nav_history[session_id] = history
+        return history
 
-        Args:
-            session_id: Optional explicit session override.
+    async def _step_history(self, delta: int, session_id: Optional[str]) -> bool:
+        """
+        Move ``delta`` entries through the session's navigation history.
 
         Returns:
-            True if navigation was successful, False if no history to go back to.
+            True if navigation was issued, False if the target entry does not exist.
         """
         resolved_session_id = await self._ensure_session_active(session_id)
 
-        # Get navigation history
-        history = await self.send(
-            "Page.getNavigationHistory",
-            {},
-            session_id=resolved_session_id,
-        )
-
+        history = await self._get_nav_history(resolved_session_id)
         current_index = history.get("currentIndex", 0)
         entries = history.get("entries", [])
 
-        if current_index <= 0 or len(entries) <= 1:
-            logger.debug("No history to go back to", extra={"session_id": resolved_session_id})
+        target_index = current_index + delta
+        if not 0 <= target_index < len(entries):
+            logger.debug(
+                f"No history to go {'back' if delta < 0 else 'forward'} to",
+                extra={"session_id": resolved_session_id},
+            )
             return False
 
-        # Navigate to previous entry
-        previous_entry = entries[current_index - 1]
         await self.send(
             "Page.navigateToHistoryEntry",
-            {"entryId": previous_entry["id"]},
+            {"entryId": entries[target_index]["id"]},
             session_id=resolved_session_id,
         )
 
+        # The history changes once the step lands; refetch it next time
+        self._nav_history.pop(resolved_session_id, None)
         return True
 
-    async def go_forward(self, *, session_id: Optional[str] = None) -> bool:
+    async def go_back(self, *, session_id: Optional[str] = None) -> bool:
         """
-        Navigate forward in browser history.
+        Navigate back in browser history.
 
         Args:
             session_id: Optional explicit session override.
 
         Returns:
-            True if navigation was successful, False if no history to go forward to.
+            True if navigation was successful, False if no history to go back to.
         """
-        resolved_session_id = await self._ensure_session_active(session_id)
+        return await self._step_history(-1, session_id)
 
-        # Get navigation history
-        history = await self.send(
-            "Page.getNavigationHistory",
-            {},
-            session_id=resolved_session_id,
-        )
-
-        current_index = history.get("currentIndex", 0)
-        entries = history.get("entries", [])
-
-        if current_index >= len(entries) - 1:
-            logger.debug("No history to go forward to", extra={"session_id": resolved_session_id})
-            return False
+    async def go_forward(self, *, session_id: Optional[str] = None) -> bool:
+        """
+        Navigate forward in browser history.
 
-        # Navigate to next entry
-        next_entry = entries[current_index + 1]
-        await self.send(
-            "Page.navigateToHistoryEntry",
-            {"entryId": next_entry["id"]},
-            session_id=resolved_session_id,
-        )
+        Args:
+            session_id: Optional explicit session override.
 
-        return True
+        Returns:
+            True if navigation was successful, False if no history to go forward to.
+        """
+        return await self._step_history(1, session_id)
 
     async def refresh(self, *, ignore_cache: bool = False, session_id: Optional[str] = None) -> None:
         """
@@ -1477,27 +1765,41 @@ class CDPClient:
         )
 
         if wait_for_load:
-            await self.wait_for_load(session_id=resolved_session_id, timeout=timeout)
+            await self._wait_for_load_inner(resolved_session_id, timeout=timeout)
 
-    async def get_current_url(self, *, session_id: Optional[str] = None) -> str:
+    async def get_location_and_title(self, *, session_id: Optional[str] = None) -> Tuple[str, str]:
         """
-        Get the current page URL.
+        Get the current page URL and title in a single round-trip.
 
         Args:
             session_id: Optional explicit session override.
 
         Returns:
-            The current URL as a string.
+            Tuple of (url, title).
         """
         resolved_session_id = await self._ensure_session_active(session_id)
 
         result = await self.send(
             "Runtime.evaluate",
-            {"expression": "window.location.href", "returnByValue": True},
+            {"expression": "[window.location.href, document.title]", "returnByValue": True},
             session_id=resolved_session_id,
         )
 
-        return result.get("result", {}).get("value", "")
+        value = result.get("result", {}).get("value") or ("", "")
+        return value[0] or "", value[1] or ""
+
+    async def get_current_url(self, *, session_id: Optional[str] = None) -> str:
+        """
+        Get the current page URL.
+
+        Args:
+            session_id: Optional explicit session override.
+
+        Returns:
+            The current URL as a string.
+        """
+        url, _ = await self.get_location_and_title(session_id=session_id)
+        return url
 
     async def get_page_title(self, *, session_id: Optional[str] = None) -> str:
         """
@@ -1509,15 +1811,8 @@ class CDPClient:
         Returns:
             The page title as a string.
         """
-        resolved_session_id = await self._ensure_session_active(session_id)
-
-        result = await self.send(
-            "Runtime.evaluate",
-            {"expression": "document.title", "returnByValue": True},
-            session_id=resolved_session_id,
-        )
-
-        return result.get("result", {}).get("value", "")
+        _, title = await self.get_location_and_title(session_id=session_id)
+        return title
 
     async def close(self) -> None:
         """
@@ -1727,8 +2022,8 @@ class CDPClient:
             # Pass through as-is for other keys
             key_info = {"key": key, "code": key, "keyCode": 0}
 
-        # Send keyDown event
-        await self.send(
+        # keyDown/char are pipelined; awaiting keyUp confirms the whole sequence
+        await self.send_oneway(
             "Input.dispatchKeyEvent",
             {
                 "type": "keyDown",
@@ -1743,7 +2038,7 @@ class CDPClient:
 
         # For printable characters, also send char event
         if len(key_info["key"]) == 1 and key_info["key"].isprintable():
-            await self.send(
+            await self.send_oneway(
                 "Input.dispatchKeyEvent",
                 {
                     "type": "char",
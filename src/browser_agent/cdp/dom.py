@@ -11,11 +11,16 @@ if TYPE_CHECKING:
 logger = logging.getLogger("browser_agent")
 
 # Default computed styles to capture (P2-28: Extract as constant)
+# Only styles BrowserDataMerger reads; every extra style adds a value per node
 DEFAULT_COMPUTED_STYLES = [
-    "display", "visibility", "opacity", "overflow", "overflow-x", 
-    "overflow-y", "cursor", "pointer-events", "position"
+    "display", "visibility", "opacity", "cursor", "pointer-events"
 ]
 
+# Command params are identical on every call; build them once (never mutated by send)
+DOCUMENT_PARAMS = {"depth": -1}
+SNAPSHOT_PARAMS = {"computedStyles": DEFAULT_COMPUTED_STYLES}
+EMPTY_PARAMS: Dict[str, Any] = {}
+
 # Default timeout for DOM operations
 DEFAULT_DOM_TIMEOUT = 30.0
 
@@ -36,12 +41,10 @@ async def get_dom(client: "CDPClient", timeout: float = DEFAULT_DOM_TIMEOUT) ->
         # Wrap in wait_for to prevent indefinite hanging (P1-15)
         results = await asyncio.wait_for(
             asyncio.gather(
-                client.send("DOM.getDocument", {"depth": -1}),
-                client.send("DOMSnapshot.captureSnapshot", {
-                    "computedStyles": DEFAULT_COMPUTED_STYLES
-                }),
-                client.send("Accessibility.getFullAXTree", {}),
-                client.send("Page.getLayoutMetrics", {}),
+                client.send("DOM.getDocument", DOCUMENT_PARAMS),
+                client.send("DOMSnapshot.captureSnapshot", SNAPSHOT_PARAMS),
+                client.send("Accessibility.getFullAXTree", EMPTY_PARAMS),
+                client.send("Page.getLayoutMetrics", EMPTY_PARAMS),
                 return_exceptions=True,
             ),
             timeout=timeout,
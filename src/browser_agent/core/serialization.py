@@ -5,13 +5,14 @@ LLM-friendly text plus a selector map for resolving follow-up actions.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 if TYPE_CHECKING:
     from browser_agent.utils.merger import EnhancedNode
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SelectorEntry:
     """Lightweight metadata describing an actionable node."""
 
@@ -31,9 +32,9 @@ class SerializedOutput:
     lines: List[str]
     selector_map: Dict[int, SelectorEntry]
 
-    @property
+    @cached_property
     def text(self) -> str:
-        """Convenience accessor returning the joined text representation."""
+        """Convenience accessor returning the joined text representation (joined once)."""
         return "\n".join(self.lines)
 
 
@@ -74,11 +75,12 @@ def serialize_dom(
     lines: List[str] = []
     selector_map: Dict[int, SelectorEntry] = {}
 
-    def _truncate(value: str) -> str:
+    # Bound as defaults so the per-value calls read locals, not closure cells
+    def _truncate(value: str, _limit: int = max_text_length, _cutoff: int = max_text_length - 3) -> str:
         value = value.strip()
-        if len(value) <= max_text_length:
+        if len(value) <= _limit:
             return value
-        return value[: max_text_length - 3] + "..."
+        return value[:_cutoff] + "..."
 
     actionable_nodes = list(nodes)
     total_nodes = len(actionable_nodes)
@@ -94,32 +96,36 @@ def serialize_dom(
             confidence_score=node.confidence_score,
         )
 
-        attr_parts = []
-        for attr in attr_allowlist:
-            value = node.attributes.get(attr)
-            if value:
-                attr_parts.append(f'{attr}="{_truncate(value)}"')
+        # Most nodes carry few (or no) attributes; skip the allowlist walk for those
+        attributes = node.attributes
+        attr_parts = [
+            f'{attr}="{_truncate(value)}"'
+            for attr in attr_allowlist
+            if (value := attributes.get(attr))
+        ] if attributes else []
 
         tag_repr = f"<{node.tag_name}>"
         if attr_parts:
             tag_repr = f"<{node.tag_name} {' '.join(attr_parts)}>"
 
-        info_parts = [f"[{index}] {tag_repr}", f"action={node.action_type}", f"conf={node.confidence_score:.2f}"]
+        # Built as one string with optional " | ..." suffixes rather than a parts list + join
+        line = f"[{index}] {tag_repr} | action={node.action_type} | conf={node.confidence_score:.2f}"
 
-        if node.ax_name:
-            info_parts.append(f'name="{_truncate(node.ax_name)}"')
+        ax_name = node.ax_name
+        if ax_name:
+            line += f' | name="{_truncate(ax_name)}"'
 
         text_content = node.text_content.strip()
-        if text_content and text_content != node.ax_name:
-            info_parts.append(f'text="{_truncate(text_content)}"')
+        if text_content and text_content != ax_name:
+            line += f' | text="{_truncate(text_content)}"'
 
         if node.is_focusable:
-            info_parts.append("focusable")
+            line += " | focusable"
 
         if not node.is_clickable and node.action_type == "click":
-            info_parts.append("not-clickable")
+            line += " | not-clickable"
 
-        lines.append(" | ".join(info_parts))
+        lines.append(line)
 
         if len(lines) >= max_lines:
             remaining = total_nodes - index
@@ -2,8 +2,11 @@
 Enhanced Node Merger - Transforms raw CDP data into actionable browser elements.
 """
 
+import heapq
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple, Any
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Tuple, Any
 
 # P2-23: Module-level constants for interactive element detection
 INTERACTIVE_TAGS = frozenset({
@@ -31,7 +34,30 @@ INPUT_TYPES_CLICK = frozenset({
     'button', 'submit', 'reset'
 })
 
-@dataclass
+CLICKABLE_TAGS = frozenset({'button', 'a'})
+
+INPUT_TYPES_CLICKABLE = INPUT_TYPES_CLICK | INPUT_TYPES_TOGGLE
+
+AX_ROLES_TEXT = frozenset({'textbox', 'searchbox'})
+AX_ROLES_SELECT = frozenset({'combobox', 'listbox'})
+AX_ROLES_TOGGLE = frozenset({'checkbox', 'radio', 'switch'})
+
+# Read-only default for lookups that miss (e.g. nodes without AX data); never stored on nodes
+_EMPTY_DICT: Mapping[str, Any] = MappingProxyType({})
+
+
+def _parse_opacity(value: str) -> float:
+    """Parse a computed opacity, treating unparseable values as fully opaque."""
+    # Nearly every element is fully opaque; skip float() for the common case
+    if value == '1':
+        return 1.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 1.0
+
+
+@dataclass(slots=True)
 class EnhancedNode:
     """Unified representation of a browser element with action metadata."""
     backend_node_id: int
@@ -62,8 +88,21 @@ class BrowserDataMerger:
         self.viewport_height = viewport_height
         
     def merge_browser_data(self, dom_data: dict, snapshot_data: dict, 
-                          ax_data: dict, metrics_data: dict) -> List[EnhancedNode]:
-        """Main entry point: merge all CDP data sources into enhanced nodes."""
+                          ax_data: dict, metrics_data: dict,
+                          top_k: Optional[int] = None) -> List[EnhancedNode]:
+        """
+        Main entry point: merge all CDP data sources into enhanced nodes.
+        
+        Args:
+            dom_data: DOM.getDocument result
+            snapshot_data: DOMSnapshot.captureSnapshot result
+            ax_data: Accessibility.getFullAXTree result
+            metrics_data: Page.getLayoutMetrics result
+            top_k: If set, return only the top_k most confident elements
+            
+        Returns:
+            Actionable nodes, most confident first
+        """
         dpr = self._calculate_dpr(metrics_data)
         self._update_viewport_from_metrics(metrics_data)
         
@@ -73,19 +112,21 @@ class BrowserDataMerger:
         
         # 2. Traverse and Create Nodes
         enhanced_nodes = []
+        occluders = []
         if 'root' in dom_data:
             self._traverse_dom_and_merge(
                 dom_data['root'], 
                 snapshot_lookup, 
                 ax_lookup, 
-                enhanced_nodes
+                enhanced_nodes,
+                occluders=occluders,
             )
         
         # 3. Apply Occlusion Detection (Z-Index/Paint Order check)
-        self._apply_occlusion_detection(enhanced_nodes)
+        self._apply_occlusion_detection(enhanced_nodes, occluders)
         
         # 4. Filter and Sort
-        return self._filter_actionable_elements(enhanced_nodes)
+        return self._filter_actionable_elements(enhanced_nodes, top_k)
     
     def _calculate_dpr(self, metrics_data: dict) -> float:
         visual_viewport = metrics_data.get('visualViewport', {})
@@ -103,9 +144,21 @@ class BrowserDataMerger:
         """
         Build a lookup table: backend_node_id -> snapshot data.
         FIX: Iterates over ALL documents (main frame + iframes) in the snapshot.
+        
+        Nodes that can never be visible (smaller than 1px or entirely outside
+        the viewport) are skipped before their styles are decoded. They would
+        fail _is_element_visible and are never used as occluders either.
+        
+        Elements with the same style indices share one (read-only) computed
+        styles dict, decoded the first time that combination is seen.
         """
         lookup = {}
         strings = snapshot_data.get('strings', [])
+        string_count = len(strings)
+        style_cache: Dict[tuple, Dict[str, str]] = {}
+        get_cached_styles = style_cache.get
+        viewport_width = self.viewport_width
+        viewport_height = self.viewport_height
         
         # Iterate over all documents (Main frame is index 0, iframes are subsequent)
         documents = snapshot_data.get('documents', [])
@@ -122,33 +175,51 @@ class BrowserDataMerger:
             styles = layout.get('styles', [])
             paint_orders = layout.get('paintOrders', [])
             
+            # Array lengths are fixed per document; read them once, not per node
+            bounds_count = len(bounds)
+            node_name_count = len(node_names)
+            node_type_count = len(node_types)
+            style_count = len(styles)
+            paint_order_count = len(paint_orders)
+            
             for i, backend_id in enumerate(backend_ids):
-                if backend_id and i < len(bounds):
+                if backend_id and i < bounds_count:
                     # CDP Snapshot bounds are usually viewport-relative already
-                    device_bounds = bounds[i]
-                    css_bounds = [coord / dpr for coord in device_bounds]
+                    dx, dy, dwidth, dheight = bounds[i]
+                    x, y, width, height = dx / dpr, dy / dpr, dwidth / dpr, dheight / dpr
+                    if (width < 1 or height < 1
+                            or x > viewport_width or y > viewport_height
+                            or x + width < 0 or y + height < 0):
+                        continue
                     
                     node_name = ""
-                    if i < len(node_names) and 0 <= node_names[i] < len(strings):
-                        node_name = strings[node_names[i]]
+                    if i < node_name_count:
+                        name_idx = node_names[i]
+                        if 0 <= name_idx < string_count:
+                            node_name = strings[name_idx]
                     
-                    computed_styles = {}
-                    if i < len(styles):
+                    if i < style_count:
                         style_indices = styles[i]
-                        for j in range(0, len(style_indices), 2):
-                            if j + 1 < len(style_indices):
-                                prop_idx = style_indices[j]
-                                val_idx = style_indices[j + 1]
-                                if (0 <= prop_idx < len(strings) and 
-                                    0 <= val_idx < len(strings)):
+                        style_key = tuple(style_indices)
+                        computed_styles = get_cached_styles(style_key)
+                        if computed_styles is None:
+                            computed_styles = {}
+                            index_iter = iter(style_indices)
+                            for prop_idx, val_idx in zip(index_iter, index_iter):
+                                if (0 <= prop_idx < string_count and 
+                                    0 <= val_idx < string_count):
                                     computed_styles[strings[prop_idx]] = strings[val_idx]
+                            style_cache[style_key] = computed_styles
+                    else:
+                        computed_styles = {}
                     
                     lookup[backend_id] = {
-                        'bounds_css': css_bounds,
-                        'node_type': node_types[i] if i < len(node_types) else 0,
+                        'bounds_css': (x, y, width, height),
+                        'click_point': (x + width / 2, y + height / 2),
+                        'node_type': node_types[i] if i < node_type_count else 0,
                         'node_name': node_name,
                         'computed_styles': computed_styles,
-                        'paint_order': paint_orders[i] if i < len(paint_orders) else 0
+                        'paint_order': paint_orders[i] if i < paint_order_count else 0
                     }
         
         return lookup
@@ -158,34 +229,60 @@ class BrowserDataMerger:
         for node in ax_data.get('nodes', []):
             backend_id = node.get('backendDOMNodeId')
             if backend_id:
-                role = node.get('role', {}).get('value', '')
-                name = node.get('name', {}).get('value', '')
+                # AX values are {"type": ..., "value": ...}; skip the {} default on misses
+                role_value = node.get('role')
+                role = role_value.get('value', '') if role_value else ''
+                name_value = node.get('name')
+                name = name_value.get('value', '') if name_value else ''
                 properties = {}
-                for prop in node.get('properties', []):
+                for prop in node.get('properties', ()):
                     prop_name = prop.get('name')
-                    prop_value = prop.get('value', {}).get('value')
+                    prop_value = prop.get('value')
+                    prop_value = prop_value.get('value') if prop_value else None
                     if prop_name and prop_value is not None:
                         properties[prop_name] = prop_value
                 lookup[backend_id] = {
                     'role': role,
+                    # Lowercased once here for the role-set checks
+                    'role_lower': role.lower(),
                     'name': name,
-                    'properties': properties
+                    'properties': properties,
+                    # Precomputed so per-element checks don't dig into properties
+                    'focusable': bool(properties.get('focusable', False)),
+                    'disabled': bool(properties.get('disabled', False)),
                 }
         return lookup
     
     def _traverse_dom_and_merge(self, root_node: dict, snapshot_lookup: dict, 
-                               ax_lookup: dict, enhanced_nodes: list, frame_id: str = None):
+                               ax_lookup: dict, enhanced_nodes: list, frame_id: str = None,
+                               occluders: Optional[list] = None):
         """
         Iteratively traverse DOM tree and merge with snapshot/AX data.
         
         Uses a stack-based approach instead of recursion to avoid hitting
         Python's recursion limit on deep DOM trees (P0-5).
+        
+        Only visible elements that can be interactive become EnhancedNodes.
+        Every visible element is also recorded in occluders as a
+        (paint_order, bounds_css, computed_styles) tuple, so plain elements
+        still count as obstacles for occlusion detection.
         """
+        if occluders is None:
+            occluders = []
         # Stack holds tuples of (node, frame_id)
         stack = [(root_node, frame_id)]
+        pop = stack.pop
+        push = stack.append
+        get_snapshot = snapshot_lookup.get
+        get_ax = ax_lookup.get
+        create_node = self._create_enhanced_node
+        append_node = enhanced_nodes.append
+        add_occluder = occluders.append
+        # The snapshot lookup already dropped entries with off-screen or empty bounds
+        is_visible = self._is_style_visible
         
         while stack:
-            node, current_frame_id = stack.pop()
+            node, current_frame_id = pop()
             
             # Update frame_id if we encounter a frame owner
             if node.get('frameId'):
@@ -195,65 +292,98 @@ class BrowserDataMerger:
             
             if node_type == 1:  # Element node
                 backend_id = node.get('backendNodeId')
-                if backend_id and backend_id in snapshot_lookup:
-                    enhanced_node = self._create_enhanced_node(
-                        node, snapshot_lookup[backend_id], ax_lookup.get(backend_id, {}), current_frame_id
-                    )
-                    if enhanced_node:
-                        enhanced_nodes.append(enhanced_node)
+                snapshot_data = get_snapshot(backend_id) if backend_id else None
+                if snapshot_data is not None:
+                    bounds_css = snapshot_data['bounds_css']
+                    computed_styles = snapshot_data['computed_styles']
+                    if is_visible(computed_styles):
+                        add_occluder((snapshot_data['paint_order'], bounds_css, computed_styles))
+                        enhanced_node = create_node(
+                            node, snapshot_data, get_ax(backend_id, _EMPTY_DICT), current_frame_id
+                        )
+                        if enhanced_node is not None:
+                            append_node(enhanced_node)
             
             # Add children to stack in reverse order to maintain traversal order
-            children = node.get('children', [])
-            for child in reversed(children):
-                stack.append((child, current_frame_id))
+            children = node.get('children')
+            if children:
+                for child in reversed(children):
+                    push((child, current_frame_id))
             
             # Handle contentDocument (Iframes/Frames)
             if 'contentDocument' in node:
-                stack.append((node['contentDocument'], current_frame_id))
+                push((node['contentDocument'], current_frame_id))
             
             # Handle Shadow Roots
             if 'shadowRoots' in node:
                 for root in reversed(node['shadowRoots']):
-                    stack.append((root, current_frame_id))
+                    push((root, current_frame_id))
 
     def _create_enhanced_node(self, dom_node: dict, snapshot_data: dict, ax_data: dict, frame_id: str) -> Optional[EnhancedNode]:
+        """
+        Build an EnhancedNode, or return None for elements that can never be actionable.
+        
+        Callers only pass elements that already passed the traversal's
+        visibility checks, so the node is built as visible without re-checking.
+        Interactivity is classified before the (subtree-walking) text extraction,
+        and the size and confidence cut-offs of _filter_actionable_elements are
+        applied before allocating the node. Occlusion only ever lowers
+        confidence, so nothing rejected here could pass the final filter.
+        """
         backend_id = dom_node.get('backendNodeId')
         tag_name = dom_node.get('nodeName', '').lower()
         
-        bounds_css = snapshot_data.get('bounds_css', [0, 0, 0, 0])
-        x, y, width, height = bounds_css
-        click_point = (x + width / 2, y + height / 2)
+        bounds_css = snapshot_data.get('bounds_css', (0.0, 0.0, 0.0, 0.0))
+        click_point = snapshot_data.get('click_point', (0.0, 0.0))
         
-        attributes = {}
-        attrs_list = dom_node.get('attributes', [])
-        for i in range(0, len(attrs_list), 2):
-            if i + 1 < len(attrs_list):
-                attributes[attrs_list[i]] = attrs_list[i + 1]
+        # Attributes arrive as a flat [name, value, name, value, ...] list
+        attrs_list = dom_node.get('attributes')
+        if attrs_list:
+            attrs_iter = iter(attrs_list)
+            attributes = dict(zip(attrs_iter, attrs_iter))
+        else:
+            attributes = {}
         
-        text_content = self._extract_text_content(dom_node)
         computed_styles = snapshot_data.get('computed_styles', {})
         
-        is_visible = self._is_element_visible(bounds_css, computed_styles)
-        is_interactive = self._is_element_interactive(tag_name, attributes, ax_data, computed_styles)
-        is_clickable = self._is_element_clickable(tag_name, attributes, ax_data, computed_styles)
-        is_focusable = ax_data.get('properties', {}).get('focusable', False)
+        # Read each shared input once; the classifiers below work on these locals
+        is_focusable = ax_data.get('focusable', False)
+        ax_role_lower = ax_data.get('role_lower', '')
+        
+        is_interactive, is_clickable = self._classify_interaction(
+            tag_name, attributes, ax_role_lower, is_focusable,
+            ax_data.get('disabled', False), computed_styles
+        )
+        if not is_interactive:
+            return None
+        
+        _, _, width, height = bounds_css
+        if width < 3 or height < 3:
+            return None
         
-        action_type = self._determine_action_type(tag_name, attributes, ax_data)
+        ax_role = ax_data.get('role', '')
+        ax_name = ax_data.get('name', '')
         confidence_score = self._calculate_confidence_score(
-            is_visible, is_interactive, ax_data, bounds_css
+            True, is_interactive, ax_role, ax_name, is_focusable, width, height
         )
+        if confidence_score < 0.3:
+            return None
+        
+        ax_properties = ax_data.get('properties', {})
+        text_content = self._extract_text_content(dom_node)
+        action_type = self._determine_action_type(tag_name, attributes, ax_role_lower)
         
         return EnhancedNode(
             backend_node_id=backend_id,
             tag_name=tag_name,
-            bounds_css=tuple(bounds_css),
+            bounds_css=bounds_css,
             click_point=click_point,
             attributes=attributes,
             text_content=text_content,
-            ax_role=ax_data.get('role', ''),
-            ax_name=ax_data.get('name', ''),
-            ax_properties=ax_data.get('properties', {}),
-            is_visible=is_visible,
+            ax_role=ax_role,
+            ax_name=ax_name,
+            ax_properties=ax_properties,
+            is_visible=True,
             is_interactive=is_interactive,
             is_clickable=is_clickable,
             is_focusable=is_focusable,
@@ -265,20 +395,29 @@ class BrowserDataMerger:
             frame_id=frame_id
         )
 
-    def _apply_occlusion_detection(self, nodes: List[EnhancedNode]):
+    def _apply_occlusion_detection(self, nodes: List[EnhancedNode],
+                                   occluders: Optional[list] = None):
         """
         Detects if elements are covered by other elements using Paint Order.
         
         P1-13: Improved to check intersection area and respect pointer-events: none.
         This is an O(N^2) operation on the node list, but N is usually small (<500).
+        
+        Args:
+            nodes: Candidate nodes to mark as occluded.
+            occluders: (paint_order, bounds_css, computed_styles) tuples for all
+                visible elements, in document order. Derived from nodes if omitted.
         """
-        # Sort by paint order descending (top-most elements first)
-        # We only care about visible elements for occlusion logic
-        visible_nodes = [n for n in nodes if n.is_visible and n.bounds_css[2] > 0 and n.bounds_css[3] > 0]
+        if occluders is None:
+            # We only care about visible elements for occlusion logic
+            occluders = [
+                (n.paint_order, n.bounds_css, n.computed_styles)
+                for n in nodes if n.is_visible and n.bounds_css[2] > 0 and n.bounds_css[3] > 0
+            ]
         
-        # Sort so we can iterate efficiently. 
+        # Sort by paint order descending (top-most elements first)
         # Higher paint_order means it is drawn ON TOP.
-        sorted_by_paint = sorted(visible_nodes, key=lambda x: x.paint_order, reverse=True)
+        sorted_by_paint = sorted(occluders, key=itemgetter(0), reverse=True)
         
         for target_node in nodes:
             if not target_node.is_visible:
@@ -290,24 +429,21 @@ class BrowserDataMerger:
                 continue
                 
             # Check against all nodes that are painted AFTER (on top of) the target
-            for obstacle in sorted_by_paint:
+            target_paint_order = target_node.paint_order
+            for paint_order, obstacle_bounds, obstacle_styles in sorted_by_paint:
                 # If we reached the target node itself or a layer below it, stop checking
-                if obstacle.paint_order <= target_node.paint_order:
+                if paint_order <= target_paint_order:
                     break
                 
                 # P1-13: Skip obstacles with pointer-events: none (they don't block clicks)
-                if obstacle.computed_styles.get('pointer-events') == 'none':
+                if obstacle_styles.get('pointer-events') == 'none':
                     continue
                 
                 # Skip transparent obstacles (opacity < 0.1)
-                try:
-                    opacity = float(obstacle.computed_styles.get('opacity', '1'))
-                    if opacity < 0.1:
-                        continue
-                except (ValueError, TypeError):
-                    pass
+                if _parse_opacity(obstacle_styles.get('opacity', '1')) < 0.1:
+                    continue
                 
-                ox, oy, owidth, oheight = obstacle.bounds_css
+                ox, oy, owidth, oheight = obstacle_bounds
                 
                 # P1-13: Calculate intersection area instead of just center point
                 # This prevents false negatives where element is 90% covered but center is visible
@@ -331,18 +467,24 @@ class BrowserDataMerger:
                         target_node.confidence_score *= (1 - coverage_ratio * 0.5)
 
     def _extract_text_content(self, dom_node: dict) -> str:
+        """Join the text nodes under dom_node in document order, without recursion."""
         text_parts = []
-        def collect_text(node):
+        stack = [dom_node]
+        pop = stack.pop
+        extend = stack.extend
+        
+        while stack:
+            node = pop()
             if node.get('nodeType') == 3:
                 text = node.get('nodeValue', '').strip()
                 if text:
                     text_parts.append(text)
-            for child in node.get('children', []):
-                collect_text(child)
-        collect_text(dom_node)
+            children = node.get('children')
+            if children:
+                extend(reversed(children))
         return ' '.join(text_parts)
     
-    def _is_element_visible(self, bounds_css: list, computed_styles: dict) -> bool:
+    def _is_element_visible(self, bounds_css: tuple, computed_styles: dict) -> bool:
         x, y, width, height = bounds_css
         
         if width < 1 or height < 1: # Stricter size check
@@ -353,95 +495,87 @@ class BrowserDataMerger:
             return False
         if x + width < 0 or y + height < 0:
             return False
-            
-        display = computed_styles.get('display', '')
-        visibility = computed_styles.get('visibility', '')
-        opacity = computed_styles.get('opacity', '1')
         
-        if display == 'none' or visibility == 'hidden':
+        return self._is_style_visible(computed_styles)
+    
+    def _is_style_visible(self, computed_styles: dict) -> bool:
+        """Style half of _is_element_visible, for bounds already known to be on screen."""
+        get_style = computed_styles.get
+        if get_style('display') == 'none' or get_style('visibility') == 'hidden':
             return False
         
-        try:
-            if float(opacity) < 0.1:
-                return False
-        except (ValueError, TypeError):
-            pass
-        
-        return True
+        return _parse_opacity(get_style('opacity', '1')) >= 0.1
     
-    def _is_element_interactive(self, tag_name: str, attributes: dict, ax_data: dict, 
-                                  computed_styles: dict = None) -> bool:
+    def _classify_interaction(self, tag_name: str, attributes: dict, ax_role: str,
+                              ax_focusable: bool, ax_disabled: bool,
+                              computed_styles: dict) -> Tuple[bool, bool]:
         """
-        Determine if an element is interactive.
+        Determine whether an element is interactive and whether it is clickable.
         
-        P1-12: Enhanced to better detect modern framework elements (React, Vue, etc.)
-        by relying more on computed styles rather than just inline event attributes.
-        """
-        computed_styles = computed_styles or {}
+        P1-12: Trusts cursor: pointer to detect modern framework elements (React,
+        Vue, etc.) rather than relying only on inline event attributes.
         
-        # Check computed styles first (P1-12: Trust cursor: pointer for React/Vue elements)
-        cursor = computed_styles.get('cursor', '')
-        if cursor == 'pointer':
-            return True
+        Both answers share the same structural checks (tag, event attributes,
+        roles, focusability, tabindex), so those are evaluated once.
         
-        # Check if pointer-events: none (definitely not interactive)
+        Args:
+            ax_role: Lowercased accessibility role.
+            ax_focusable: AX "focusable" property.
+            ax_disabled: AX "disabled" property.
+        
+        Returns:
+            (is_interactive, is_clickable)
+        """
+        cursor = computed_styles.get('cursor', '')
         pointer_events = computed_styles.get('pointer-events', '')
-        if pointer_events == 'none':
-            return False
         
         # Use module-level constants (P2-23)
-        if tag_name in INTERACTIVE_TAGS:
-            return True
-        
-        if any(attr in attributes for attr in EVENT_ATTRS):
-            return True
-        
-        role = attributes.get('role', '').lower()
-        if role in INTERACTIVE_ROLES:
-            return True
-        
-        ax_role = ax_data.get('role', '').lower()
-        if ax_role in INTERACTIVE_ROLES:
-            return True
-        
-        if ax_data.get('properties', {}).get('focusable'):
-            return True
+        structural = (
+            tag_name in INTERACTIVE_TAGS
+            or not EVENT_ATTRS.isdisjoint(attributes)
+            or attributes.get('role', '').lower() in INTERACTIVE_ROLES
+            or ax_role in INTERACTIVE_ROLES
+            or ax_focusable
+        )
+        if not structural:
+            # Check for tabindex (makes element focusable/interactive)
+            tabindex = attributes.get('tabindex', '')
+            structural = bool(tabindex) and tabindex != '-1'
         
-        # Check for tabindex (makes element focusable/interactive)
-        tabindex = attributes.get('tabindex', '')
-        if tabindex and tabindex != '-1':
-            return True
+        # Computed styles first (P1-12): pointer cursor wins, pointer-events: none loses
+        if cursor == 'pointer':
+            is_interactive = True
+        elif pointer_events == 'none':
+            is_interactive = False
+        else:
+            is_interactive = structural
         
-        return False
-    
-    def _is_element_clickable(self, tag_name: str, attributes: dict, ax_data: dict, computed_styles: dict) -> bool:
-        if not self._is_element_interactive(tag_name, attributes, ax_data):
-            return False
+        # Clickability needs structural interactivity; styles alone don't make an element clickable
+        if not structural:
+            return is_interactive, False
         
-        if attributes.get('disabled') == 'true' or attributes.get('disabled') == '':
-            return False
+        if attributes.get('disabled') in ('true', ''):
+            return is_interactive, False
         
-        if ax_data.get('properties', {}).get('disabled'):
-            return False
+        if ax_disabled:
+            return is_interactive, False
         
-        cursor = computed_styles.get('cursor', '')
         if cursor == 'pointer':
-            return True
+            return is_interactive, True
         
-        pointer_events = computed_styles.get('pointer-events', '')
         if pointer_events == 'none':
-            return False
+            return is_interactive, False
         
-        if tag_name in {'button', 'a'}:
-            return True
+        if tag_name in CLICKABLE_TAGS:
+            return is_interactive, True
         
         if tag_name == 'input':
             input_type = attributes.get('type', 'text').lower()
-            return input_type in {'button', 'submit', 'reset', 'checkbox', 'radio'}
+            return is_interactive, input_type in INPUT_TYPES_CLICKABLE
         
-        return True
+        return is_interactive, True
     
-    def _determine_action_type(self, tag_name: str, attributes: dict, ax_data: dict) -> str:
+    def _determine_action_type(self, tag_name: str, attributes: dict, ax_role: str) -> str:
         # Use module-level constants (P2-23)
         if tag_name == 'input':
             input_type = attributes.get('type', 'text').lower()
@@ -458,18 +592,18 @@ class BrowserDataMerger:
         if tag_name == 'select':
             return 'select'
         
-        ax_role = ax_data.get('role', '').lower()
-        if ax_role in {'textbox', 'searchbox'}:
+        if ax_role in AX_ROLES_TEXT:
             return 'input'
-        elif ax_role in {'combobox', 'listbox'}:
+        elif ax_role in AX_ROLES_SELECT:
             return 'select'
-        elif ax_role in {'checkbox', 'radio', 'switch'}:
+        elif ax_role in AX_ROLES_TOGGLE:
             return 'toggle'
         
         return 'click'
     
     def _calculate_confidence_score(self, is_visible: bool, is_interactive: bool, 
-                                  ax_data: dict, bounds_css: list) -> float:
+                                  ax_role: str, ax_name: str, is_focusable: bool,
+                                  width: float, height: float) -> float:
         score = 0.0
         
         if is_visible:
@@ -477,14 +611,13 @@ class BrowserDataMerger:
         if is_interactive:
             score += 0.3
         
-        if ax_data.get('role'):
+        if ax_role:
             score += 0.2
-        if ax_data.get('name'):
+        if ax_name:
             score += 0.1
-        if ax_data.get('properties', {}).get('focusable'):
+        if is_focusable:
             score += 0.1
         
-        width, height = bounds_css[2], bounds_css[3]
         if width >= 10 and height >= 10:
             score += 0.1
         elif width < 5 or height < 5:
@@ -492,25 +625,20 @@ class BrowserDataMerger:
         
         return max(0.0, min(1.0, score))
     
-    def _filter_actionable_elements(self, enhanced_nodes: List[EnhancedNode]) -> List[EnhancedNode]:
-        actionable = []
-        
-        for node in enhanced_nodes:
-            # Filter out occluded or invisible nodes
-            if not node.is_visible or node.is_occluded:
-                continue
-            
-            if not node.is_interactive:
-                continue
-            
-            if node.confidence_score < 0.3:
-                continue
-            
-            width, height = node.bounds_css[2], node.bounds_css[3]
-            if width < 3 or height < 3:
-                continue
-            
-            actionable.append(node)
-        
-        actionable.sort(key=lambda x: x.confidence_score, reverse=True)
-        return actionable
\ No newline at end of file
+    def _filter_actionable_elements(self, enhanced_nodes: List[EnhancedNode],
+                                    top_k: Optional[int] = None) -> List[EnhancedNode]:
+        # Drop occluded, invisible, non-interactive, low-confidence and tiny nodes
+        actionable = [
+            node for node in enhanced_nodes
+            if node.is_visible
+            and not node.is_occluded
+            and node.is_interactive
+            and node.confidence_score >= 0.3
+            and node.bounds_css[2] >= 3
+            and node.bounds_css[3] >= 3
+        ]
+        if top_k is not None:
+            # Same order as the full sort below (ties keep DOM order), without sorting everything
+            return heapq.nlargest(top_k, actionable, key=attrgetter('confidence_score'))
+        actionable.sort(key=attrgetter('confidence_score'), reverse=True)
+        return actionable
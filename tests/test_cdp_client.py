@@ -0,0 +1,526 @@
+"""
+Tests for the CDP client (no Chrome required).
+
+The websocket and CDP round-trips are mocked so these tests exercise the
+client's bookkeeping and command sequencing only.
+
+Run with: pytest tests/test_cdp_client.py -v
+"""
+import asyncio
+import json
+import logging
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from browser_agent.cdp.client import CDPClient, get_page_ws_url
+from browser_agent.core.errors import CDPConnectionError, CDPProtocolError
+from browser_agent.utils.merger import EnhancedNode
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def make_node(**overrides) -> EnhancedNode:
+    """Build a minimal EnhancedNode for action tests."""
+    fields = dict(
+        backend_node_id=42,
+        tag_name="input",
+        bounds_css=(10.0, 20.0, 100.0, 30.0),
+        click_point=(60.0, 35.0),
+        attributes={"type": "text"},
+        text_content="",
+        ax_role="textbox",
+        ax_name="Search",
+        ax_properties={},
+        is_visible=True,
+        is_interactive=True,
+        is_clickable=True,
+        is_focusable=True,
+        is_occluded=False,
+        computed_styles={},
+        paint_order=1,
+        action_type="input",
+        confidence_score=0.9,
+    )
+    fields.update(overrides)
+    return EnhancedNode(**fields)
+
+
+class FakeWebSocket:
+    """In-memory websocket that answers every command with an empty result."""
+
+    def __init__(self):
+        self.sent = []
+        self._incoming: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, message, text=None):
+        self.sent.append((message, text))
+        data = json.loads(message)
+        await self._incoming.put(json.dumps({"id": data["id"], "result": {"echo": data["method"]}}).encode())
+
+    async def recv(self, decode=None):
+        return await self._incoming.get()
+
+    def push_event(self, event: dict):
+        self._incoming.put_nowait(json.dumps(event).encode())
+
+
+@pytest.fixture
+def client():
+    """CDPClient with a registered active session and mocked transport."""
+    c = CDPClient("ws://localhost:9222/devtools/page/test")
+    c.registry.add_target("target-1", "page", "https://example.com", "Example")
+    c.registry.add_session("session-1", "target-1")
+    c.registry.set_active_session("session-1")
+    c.send = AsyncMock(return_value={})
+    c.send_oneway = AsyncMock(return_value=None)
+    return c
+
+
+def sent_methods(client) -> list:
+    """Method names sent through send() and send_oneway(), awaited ones last per call."""
+    return [call.args[0] for call in client.send_oneway.await_args_list + client.send.await_args_list]
+
+
+# =============================================================================
+# Session Resolution Tests
+# =============================================================================
+
+class TestSessionResolution:
+    """Tests that composite actions resolve the session only once."""
+
+    async def test_type_text_resolves_session_once(self, client):
+        """type_text with click_to_focus should not re-verify the session in the click."""
+        ensure = AsyncMock(return_value="session-1")
+        client._ensure_session_active = ensure
+
+        await client.type_text(make_node(), "hello")
+
+        assert ensure.await_count == 1
+        assert "Input.dispatchMouseEvent" in sent_methods(client)
+        methods = [call.args[0] for call in client.send.await_args_list]
+        assert methods[-1] == "Input.insertText"
+
+    async def test_click_node_still_validates_input(self, client):
+        """The public click_node wrapper keeps its argument validation."""
+        with pytest.raises(ValueError):
+            await client.click_node(object())
+
+
+# =============================================================================
+# Navigation History Tests
+# =============================================================================
+
+class TestNavigationHistory:
+    """Tests for the cached navigation history used by go_back/go_forward."""
+
+    HISTORY = {
+        "currentIndex": 1,
+        "entries": [{"id": 10}, {"id": 11}, {"id": 12}],
+    }
+    FIRST_ENTRY = {
+        "currentIndex": 0,
+        "entries": [{"id": 10}, {"id": 11}],
+    }
+
+    def _mock_send(self, client, history=None):
+        history = history or self.HISTORY
+
+        async def send(method, params=None, session_id=None, **kwargs):
+            if method == "Page.getNavigationHistory":
+                return {
+                    "currentIndex": history["currentIndex"],
+                    "entries": list(history["entries"]),
+                }
+            return {}
+        client.send = AsyncMock(side_effect=send)
+
+    def _history_fetches(self, client):
+        return [c for c in client.send.await_args_list if c.args[0] == "Page.getNavigationHistory"]
+
+    async def test_step_drops_cached_history(self, client):
+        """Each issued step refetches the history instead of guessing the new index."""
+        self._mock_send(client)
+
+        assert await client.go_back() is True
+        assert await client.go_forward() is True
+
+        assert len(self._history_fetches(client)) == 2
+        assert "session-1" not in client._nav_history
+        entry_ids = [
+            c.args[1]["entryId"] for c in client.send.await_args_list
+            if c.args[0] == "Page.navigateToHistoryEntry"
+        ]
+        assert entry_ids == [10, 12]
+
+    async def test_out_of_range_step_reuses_cache(self, client):
+        """Stepping past either end does not navigate and keeps the cached history."""
+        self._mock_send(client, self.FIRST_ENTRY)
+
+        assert await client.go_back() is False
+        assert await client.go_back() is False
+
+        assert len(self._history_fetches(client)) == 1
+
+    async def test_main_frame_navigation_invalidates_cache(self, client):
+        """Page.frameNavigated on the main frame drops the cached history."""
+        self._mock_send(client, self.FIRST_ENTRY)
+
+        await client.go_back()
+        client._handle_event({
+            "method": "Page.frameNavigated",
+            "sessionId": "session-1",
+            "params": {"frame": {"id": "frame-1", "url": "https://example.com/"}},
+        })
+        await client.go_back()
+
+        assert len(self._history_fetches(client)) == 2
+
+
+# =============================================================================
+# Transport Tests
+# =============================================================================
+
+class TestTransport:
+    """Tests for the send/listen round-trip over a fake websocket."""
+
+    async def test_send_round_trip(self):
+        """Commands go out as UTF-8 text frames and responses resolve the future."""
+        client = CDPClient("ws://localhost:9222/devtools/page/test")
+        client.ws = FakeWebSocket()
+        client._listen_task = asyncio.create_task(client.listen())
+        try:
+            result = await client.send("Target.getTargets", {}, use_retry=False)
+        finally:
+            client._listen_task.cancel()
+
+        assert result == {"echo": "Target.getTargets"}
+        message, text = client.ws.sent[0]
+        assert isinstance(message, bytes)
+        assert text is True
+        assert json.loads(message)["method"] == "Target.getTargets"
+
+    async def test_connect_raises_frame_limit_and_disables_compression(self, monkeypatch):
+        """Large snapshot frames are accepted and frames are not deflated."""
+        import browser_agent.cdp.client as client_module
+        connect_kwargs = {}
+
+        async def fake_connect(url, **kwargs):
+            connect_kwargs.update(kwargs)
+            raise OSError("no chrome")
+        monkeypatch.setattr(client_module, "connect", fake_connect)
+
+        client = CDPClient("ws://localhost:9222/devtools/page/test")
+        with pytest.raises(CDPConnectionError):
+            await client.connect()
+
+        assert connect_kwargs["max_size"] >= 64 * 1024 * 1024
+        assert connect_kwargs["compression"] is None
+
+    async def test_send_oneway_registers_no_future(self):
+        """One-way commands are written without a pending response future."""
+        client = CDPClient("ws://localhost:9222/devtools/page/test")
+        client.ws = FakeWebSocket()
+
+        await client.send_oneway("Target.setDiscoverTargets", {"discover": True})
+        await client.send_oneway("Target.setDiscoverTargets", {"discover": True})
+
+        assert client.pending_message == {}
+        ids = [json.loads(message)["id"] for message, _ in client.ws.sent]
+        assert ids[1] == ids[0] + 1
+
+    async def test_send_oneway_error_is_logged_with_method(self, caplog):
+        """A rejected one-way command logs a warning naming its method."""
+        class RejectingWebSocket(FakeWebSocket):
+            async def send(self, message, text=None):
+                data = json.loads(message)
+                error = {"code": -32000, "message": "Node is not visible"}
+                await self._incoming.put(json.dumps({"id": data["id"], "error": error}).encode())
+
+        client = CDPClient("ws://localhost:9222/devtools/page/test")
+        client.ws = RejectingWebSocket()
+        await client.send_oneway("Target.setDiscoverTargets", {"discover": True})
+
+        with caplog.at_level(logging.WARNING, logger="browser_agent"):
+            client._listen_task = asyncio.create_task(client.listen())
+            try:
+                await asyncio.sleep(0.01)
+            finally:
+                client._listen_task.cancel()
+
+        assert client._oneway_methods == {}
+        warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+        assert warnings == ["CDP error for one-way command Target.setDiscoverTargets: Node is not visible"]
+
+
+# =============================================================================
+# Frame Registry Tests
+# =============================================================================
+
+class TestFrameTree:
+    """Tests for frame tree parsing into the session registry."""
+
+    def test_parse_frame_tree_registers_children_in_order(self, client):
+        """Nested frames are registered with their parents, in document order."""
+        tree = {
+            "frame": {"id": "main", "url": "https://example.com/", "securityOrigin": "https://example.com"},
+            "childFrames": [
+                {"frame": {"id": "a", "url": "https://example.com/a", "securityOrigin": "https://example.com"}},
+                {
+                    "frame": {"id": "b", "url": "https://example.com/b", "securityOrigin": "https://example.com"},
+                    "childFrames": [
+                        {"frame": {"id": "b1", "url": "https://example.com/b1", "securityOrigin": "https://example.com"}},
+                    ],
+                },
+            ],
+        }
+
+        client._parse_frame_tree(tree, parent_frame_id=None, target_id="target-1", session_id="session-1")
+
+        registry = client.registry
+        assert set(registry.frames) == {"main", "a", "b", "b1"}
+        assert registry.get_frame_children("main") == ["a", "b"]
+        assert registry.get_frame("b1").parent_frame_id == "b"
+        assert registry.get_session_from_frame("b1") == "session-1"
+
+    def test_map_target_to_frames_prefers_origin(self, client):
+        """Frames with a known origin only match targets of the same origin."""
+        registry = client.registry
+        registry.add_frame("same", None, "https://ads.example.net/slot", "https://ads.example.net")
+        registry.add_frame("other", None, "https://example.com/page", "https://example.com")
+        registry.add_frame("pending", None, "https://ads.example.net/", "")
+
+        client._map_target_to_frames("oopif", "https://ads.example.net/", "session-2")
+
+        assert registry.get_frame("same").target_id == "oopif"
+        assert registry.get_frame("same").session_id == "session-2"
+        assert registry.get_frame("pending").target_id == "oopif"
+        assert registry.get_frame("other").target_id is None
+
+
+# =============================================================================
+# Page Info Tests
+# =============================================================================
+
+class TestPageInfo:
+    """Tests for URL/title helpers."""
+
+    async def test_location_and_title_single_evaluate(self, client):
+        """URL and title come back from one Runtime.evaluate call."""
+        client.send = AsyncMock(return_value={"result": {"value": ["https://example.com/", "Example"]}})
+
+        assert await client.get_location_and_title() == ("https://example.com/", "Example")
+        assert client.send.await_count == 1
+
+    async def test_location_and_title_handles_missing_value(self, client):
+        """A missing evaluate value falls back to empty strings."""
+        client.send = AsyncMock(return_value={"result": {}})
+
+        assert await client.get_current_url() == ""
+        assert await client.get_page_title() == ""
+
+
+# =============================================================================
+# Typing Tests
+# =============================================================================
+
+class TestTyping:
+    """Tests for text entry."""
+
+    async def test_clear_existing_uses_key_events(self, client):
+        """clear_existing selects and deletes via key events, without resolving the node."""
+        await client.type_text(make_node(), "hello", clear_existing=True, click_to_focus=False)
+
+        methods = sent_methods(client)
+        assert "DOM.resolveNode" not in methods
+        assert "Runtime.callFunctionOn" not in methods
+        key_events = [
+            call.args[1]
+            for call in client.send_oneway.await_args_list + client.send.await_args_list
+            if call.args[0] == "Input.dispatchKeyEvent"
+        ]
+        assert key_events[0]["commands"] == ["selectAll"]
+        assert [e["key"] for e in key_events] == ["a", "a", "Delete", "Delete"]
+        assert methods[-1] == "Input.insertText"
+
+    async def test_clear_existing_without_focus_clears_the_node(self, client):
+        """If DOM.focus fails, no key events are sent; the node itself is cleared."""
+        async def send(method, params=None, **kwargs):
+            if method == "DOM.focus":
+                raise CDPProtocolError("Element is not focusable")
+            if method == "DOM.resolveNode":
+                return {"object": {"objectId": "obj-1"}}
+            return {}
+        client.send = AsyncMock(side_effect=send)
+
+        await client.type_text(make_node(), "hello", clear_existing=True, click_to_focus=False)
+
+        methods = sent_methods(client)
+        assert "Input.dispatchKeyEvent" not in methods
+        assert methods[-3:] == ["DOM.resolveNode", "Runtime.callFunctionOn", "Input.insertText"]
+        call_args = [c.args[1] for c in client.send.await_args_list if c.args[0] == "Runtime.callFunctionOn"]
+        assert call_args[0]["objectId"] == "obj-1"
+
+
+# =============================================================================
+# Input Pipelining Tests
+# =============================================================================
+
+class TestInputPipelining:
+    """Tests that only the last event of an input sequence is awaited."""
+
+    async def test_click_awaits_only_release(self, client):
+        """mouseMoved/mousePressed are one-way; mouseReleased is awaited."""
+        await client.click_node(make_node())
+
+        oneway = [call.args[1]["type"] for call in client.send_oneway.await_args_list]
+        awaited = [
+            call.args[1]["type"] for call in client.send.await_args_list
+            if call.args[0] == "Input.dispatchMouseEvent"
+        ]
+        assert oneway == ["mouseMoved", "mousePressed"]
+        assert awaited == ["mouseReleased"]
+
+    async def test_delayed_typing_awaits_last_char(self, client):
+        """Per-character typing pipelines all characters but the last."""
+        await client.type_text(make_node(), "abc", click_to_focus=False, delay_between_chars=0.001)
+
+        oneway = [call.args[1]["text"] for call in client.send_oneway.await_args_list]
+        awaited = [
+            call.args[1]["text"] for call in client.send.await_args_list
+            if call.args[0] == "Input.insertText"
+        ]
+        assert oneway == ["a", "b"]
+        assert awaited == ["c"]
+
+
+# =============================================================================
+# Teardown Tests
+# =============================================================================
+
+class TestPendingInvalidation:
+    """Tests for failing in-flight commands when the listen loop stops."""
+
+    async def test_connection_close_fails_pending_and_swaps_map(self):
+        """Old futures fail; a command registered during teardown survives."""
+        client = CDPClient("ws://localhost:9222/devtools/page/test")
+        loop = asyncio.get_running_loop()
+        late = loop.create_future()
+
+        def register_late(_):
+            client.pending_message[99] = late
+
+        old = loop.create_future()
+        old.add_done_callback(register_late)
+        client.pending_message[1] = old
+
+        client._invalidate_pending(CDPConnectionError("WebSocket connection closed"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(CDPConnectionError):
+            old.result()
+        assert client.pending_message == {99: late}
+        assert not late.done()
+
+
+# =============================================================================
+# Domain Enable Tests
+# =============================================================================
+
+class TestEnableDomains:
+    """Tests for enabling CDP domains on a session."""
+
+    async def test_enables_are_sent_concurrently(self, client):
+        """All enables are in flight before any of them completes."""
+        in_flight = []
+        release = asyncio.Event()
+
+        async def send(method, params=None, session_id=None, **kwargs):
+            in_flight.append(method)
+            await release.wait()
+            return {}
+        client.send = AsyncMock(side_effect=send)
+
+        task = asyncio.create_task(client.enable_domains(["DOM", "Page", "Runtime"], "session-1"))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert in_flight == ["DOM.enable", "Page.enable", "Runtime.enable"]
+        release.set()
+        await task
+
+        assert client.registry.is_domain_enabled("session-1", "Runtime")
+
+    async def test_already_enabled_domains_are_skipped(self, client):
+        """Domains marked enabled are not re-sent."""
+        client.registry.mark_domain_enabled("session-1", "Page")
+
+        await client.enable_domains(["Page", "Network"], "session-1")
+
+        assert [c.args[0] for c in client.send.await_args_list] == ["Network.enable"]
+
+
+# =============================================================================
+# Discovery Tests
+# =============================================================================
+
+class TestPageDiscovery:
+    """Tests for finding the page websocket URL over HTTP."""
+
+    async def test_reuses_given_http_client(self):
+        """A caller-provided client is used for every lookup."""
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            return httpx.Response(200, json=[
+                {"type": "service_worker", "webSocketDebuggerUrl": "ws://sw"},
+                {"type": "page", "webSocketDebuggerUrl": "ws://page"},
+            ])
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            assert await get_page_ws_url(http_client=http_client) == "ws://page"
+            assert await get_page_ws_url(http_client=http_client) == "ws://page"
+
+        assert requests == ["/json", "/json"]
+
+
+# =============================================================================
+# Load Wait Tests
+# =============================================================================
+
+class TestWaitForLoad:
+    """Tests for the event-driven page load wait."""
+
+    async def test_load_event_wakes_waiter_without_polling(self, client):
+        """Page.loadEventFired ends the wait before check_interval elapses."""
+        wait = asyncio.create_task(client.wait_for_load(
+            timeout=5.0, network_idle_threshold=0.0, check_interval=10.0,
+        ))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        evaluates_before = [c for c in client.send.await_args_list if c.args[0] == "Runtime.evaluate"]
+
+        client._handle_event({"method": "Page.loadEventFired", "sessionId": "session-1", "params": {}})
+        await asyncio.wait_for(wait, timeout=1.0)
+
+        evaluates_after = [c for c in client.send.await_args_list if c.args[0] == "Runtime.evaluate"]
+        assert evaluates_after == evaluates_before
+
+    async def test_concurrent_waiters_each_get_the_wakeup(self, client):
+        """One load event wakes every waiter on the session, not just the first."""
+        waits = [
+            asyncio.create_task(client.wait_for_load(
+                timeout=5.0, network_idle_threshold=0.0, check_interval=10.0,
+            ))
+            for _ in range(2)
+        ]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert len(client._load_wakeups["session-1"]) == 2
+
+        client._handle_event({"method": "Page.loadEventFired", "sessionId": "session-1", "params": {}})
+        await asyncio.wait_for(asyncio.gather(*waits), timeout=1.0)
+
+        assert "session-1" not in client._load_wakeups
@@ -0,0 +1,397 @@
+"""
+Tests for BrowserDataMerger (no Chrome required).
+
+The CDP payloads are small hand-built DOM/DOMSnapshot/AX structures that
+mirror the shapes Chrome returns.
+
+Run with: pytest tests/test_merger.py -v
+"""
+import copy
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from browser_agent.utils.merger import BrowserDataMerger, _parse_opacity
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+STYLE_NAMES = ["display", "visibility", "opacity", "cursor", "pointer-events"]
+
+
+def build_page(elements):
+    """
+    Build (dom, snapshot, ax, metrics) for a flat list of elements under <body>.
+
+    Each element is a dict with: tag, bounds, and optional attrs, text, styles,
+    role, name, paint_order.
+    """
+    strings = []
+
+    def intern(value):
+        if value not in strings:
+            strings.append(value)
+        return strings.index(value)
+
+    children = []
+    backend_ids, node_names, bounds, styles, paint_orders = [], [], [], [], []
+    ax_nodes = []
+    for index, element in enumerate(elements):
+        backend_id = 100 + index
+        attrs = []
+        for key, value in element.get("attrs", {}).items():
+            attrs.extend([key, value])
+        text = element.get("text")
+        children.append({
+            "nodeType": 1,
+            "nodeName": element["tag"].upper(),
+            "backendNodeId": backend_id,
+            "attributes": attrs,
+            "children": [{"nodeType": 3, "nodeValue": text}] if text else [],
+        })
+        backend_ids.append(backend_id)
+        node_names.append(intern(element["tag"].upper()))
+        bounds.append(list(element["bounds"]))
+        style_values = {"display": "block", "visibility": "visible", "opacity": "1",
+                        "cursor": "auto", "pointer-events": "auto"}
+        style_values.update(element.get("styles", {}))
+        pairs = []
+        for name in STYLE_NAMES:
+            pairs.extend([intern(name), intern(style_values[name])])
+        styles.append(pairs)
+        paint_orders.append(element.get("paint_order", index + 1))
+        if element.get("role"):
+            ax_nodes.append({
+                "backendDOMNodeId": backend_id,
+                "role": {"value": element["role"]},
+                "name": {"value": element.get("name", "")},
+                "properties": [],
+            })
+
+    dom = {"root": {"nodeType": 9, "children": [
+        {"nodeType": 1, "nodeName": "BODY", "backendNodeId": 1, "attributes": [], "children": children},
+    ]}}
+    snapshot = {
+        "strings": strings,
+        "documents": [{
+            "nodes": {"backendNodeId": backend_ids, "nodeType": [1] * len(elements), "nodeName": node_names},
+            "layout": {"bounds": bounds, "styles": styles, "paintOrders": paint_orders},
+        }],
+    }
+    ax = {"nodes": ax_nodes}
+    metrics = {
+        "visualViewport": {"clientWidth": 1280, "clientHeight": 720},
+        "cssVisualViewport": {"clientWidth": 1280, "clientHeight": 720},
+    }
+    return dom, snapshot, ax, metrics
+
+
+@pytest.fixture
+def merger():
+    return BrowserDataMerger()
+
+
+def merge(merger, elements):
+    return merger.merge_browser_data(*build_page(elements))
+
+
+# =============================================================================
+# Snapshot Lookup Tests
+# =============================================================================
+
+class TestSnapshotLookup:
+    """Tests for building the backend_node_id -> snapshot data table."""
+
+    def test_decodes_styles_and_bounds(self, merger):
+        """Visible nodes get CSS bounds, tag name and decoded styles."""
+        _, snapshot, _, _ = build_page([
+            {"tag": "button", "bounds": (10, 20, 100, 30), "styles": {"cursor": "pointer"}},
+        ])
+
+        lookup = merger._build_snapshot_lookup(snapshot, dpr=2.0)
+
+        entry = lookup[100]
+        assert entry["bounds_css"] == (5.0, 10.0, 50.0, 15.0)
+        assert entry["click_point"] == (30.0, 17.5)
+        assert entry["node_name"] == "BUTTON"
+        assert entry["computed_styles"]["cursor"] == "pointer"
+
+    def test_identical_styles_share_one_dict(self, merger):
+        """Nodes with the same style indices reuse the decoded styles."""
+        _, snapshot, _, _ = build_page([
+            {"tag": "li", "bounds": (10, 10, 100, 30)},
+            {"tag": "li", "bounds": (10, 50, 100, 30)},
+            {"tag": "li", "bounds": (10, 90, 100, 30), "styles": {"cursor": "pointer"}},
+        ])
+
+        lookup = merger._build_snapshot_lookup(snapshot, dpr=1.0)
+
+        assert lookup[100]["computed_styles"] is lookup[101]["computed_styles"]
+        assert lookup[102]["computed_styles"]["cursor"] == "pointer"
+        assert lookup[100]["computed_styles"]["cursor"] == "auto"
+
+    def test_skips_nodes_that_cannot_be_visible(self, merger):
+        """Zero-size and off-viewport nodes are not decoded."""
+        _, snapshot, _, _ = build_page([
+            {"tag": "button", "bounds": (10, 10, 100, 30)},
+            {"tag": "button", "bounds": (10, 10, 0, 30)},
+            {"tag": "button", "bounds": (5000, 10, 100, 30)},
+            {"tag": "button", "bounds": (10, -500, 100, 30)},
+        ])
+
+        lookup = merger._build_snapshot_lookup(snapshot, dpr=1.0)
+
+        assert set(lookup) == {100}
+
+
+# =============================================================================
+# Merge Tests
+# =============================================================================
+
+class TestMerge:
+    """End-to-end tests for merge_browser_data."""
+
+    def test_returns_visible_interactive_elements(self, merger):
+        """Only visible, interactive elements are returned."""
+        nodes = merge(merger, [
+            {"tag": "button", "bounds": (10, 10, 100, 30), "text": "Submit", "role": "button", "name": "Submit"},
+            {"tag": "div", "bounds": (10, 50, 100, 30), "text": "Plain"},
+            {"tag": "a", "bounds": (10, 90, 100, 30), "styles": {"display": "none"}},
+        ])
+
+        assert [n.tag_name for n in nodes] == ["button"]
+        assert nodes[0].attributes == {}
+        assert nodes[0].text_content == "Submit"
+        assert nodes[0].click_point == (60.0, 25.0)
+
+    def test_attributes_paired_from_flat_list(self, merger):
+        """Attribute name/value pairs become a dict."""
+        nodes = merge(merger, [
+            {"tag": "input", "bounds": (10, 10, 100, 30), "attrs": {"type": "email", "name": "user"}},
+        ])
+
+        assert nodes[0].attributes == {"type": "email", "name": "user"}
+        assert nodes[0].action_type == "input"
+
+    def test_sorted_by_confidence(self, merger):
+        """Elements with accessibility data rank ahead of bare ones, ties keep DOM order."""
+        nodes = merge(merger, [
+            {"tag": "a", "bounds": (10, 10, 100, 30)},
+            {"tag": "button", "bounds": (10, 50, 100, 30), "role": "button", "name": "Go"},
+            {"tag": "a", "bounds": (10, 90, 100, 30), "attrs": {"href": "/x"}},
+        ])
+
+        assert [n.backend_node_id for n in nodes] == [101, 100, 102]
+
+    def test_top_k_keeps_most_confident(self, merger):
+        """top_k returns the head of the full ordering."""
+        elements = [
+            {"tag": "a", "bounds": (10, 10, 100, 30)},
+            {"tag": "button", "bounds": (10, 50, 100, 30), "role": "button", "name": "Go"},
+            {"tag": "a", "bounds": (10, 90, 100, 30), "attrs": {"href": "/x"}},
+        ]
+
+        nodes = merger.merge_browser_data(*build_page(elements), top_k=2)
+
+        assert [n.backend_node_id for n in nodes] == [101, 100]
+
+    def test_covering_element_occludes_target(self, merger):
+        """An element painted on top of most of the target hides it."""
+        nodes = merge(merger, [
+            {"tag": "button", "bounds": (10, 10, 100, 30), "paint_order": 1},
+            {"tag": "div", "bounds": (0, 0, 200, 100), "paint_order": 2},
+        ])
+
+        assert nodes == []
+
+    def test_non_interactive_elements_are_not_built(self, merger):
+        """Plain elements return no node, so their text is never extracted."""
+        dom_node = {"nodeType": 1, "nodeName": "DIV", "backendNodeId": 5, "attributes": [],
+                    "children": [{"nodeType": 3, "nodeValue": "Plain"}]}
+        snapshot_data = {"bounds_css": [0, 0, 50, 50], "click_point": (25, 25), "paint_order": 1,
+                         "computed_styles": {"cursor": "auto"}}
+        merger._extract_text_content = None
+
+        assert merger._create_enhanced_node(dom_node, snapshot_data, {}, None) is None
+
+    def test_tiny_elements_are_not_built(self, merger):
+        """Elements below the actionable size are rejected before allocation."""
+        dom_node = {"nodeType": 1, "nodeName": "BUTTON", "backendNodeId": 5, "attributes": []}
+        snapshot_data = {"bounds_css": (0.0, 0.0, 2.0, 50.0), "click_point": (1.0, 25.0),
+                         "paint_order": 1, "computed_styles": {}}
+
+        assert merger._create_enhanced_node(dom_node, snapshot_data, {}, None) is None
+
+    def test_occlusion_ignores_invisible_obstacles(self, merger):
+        """Hidden elements on top neither become nodes nor occlude."""
+        nodes = merge(merger, [
+            {"tag": "button", "bounds": (10, 10, 100, 30), "paint_order": 1},
+            {"tag": "div", "bounds": (0, 0, 200, 100), "paint_order": 2, "styles": {"visibility": "hidden"}},
+        ])
+
+        assert [n.backend_node_id for n in nodes] == [100]
+
+
+# =============================================================================
+# EnhancedNode Tests
+# =============================================================================
+
+class TestEnhancedNode:
+    """Tests for the EnhancedNode record type."""
+
+    def test_uses_slots(self, merger):
+        """Nodes carry no per-instance __dict__."""
+        nodes = merge(merger, [{"tag": "button", "bounds": (10, 10, 100, 30)}])
+
+        assert not hasattr(nodes[0], "__dict__")
+        nodes[0].is_occluded = True
+        assert nodes[0].is_occluded is True
+
+    def test_nodes_copy_pickle_and_serialize(self, merger):
+        """Nodes without attributes or AX data still hold plain dicts."""
+        nodes = merge(merger, [{"tag": "button", "bounds": (10, 10, 100, 30)}])
+
+        node = nodes[0]
+        assert type(node.attributes) is dict
+        assert type(node.ax_properties) is dict
+        assert copy.deepcopy(node) == node
+        assert pickle.loads(pickle.dumps(node)) == node
+        assert json.loads(json.dumps(dataclasses.asdict(node)))["attributes"] == {}
+
+
+# =============================================================================
+# Text Extraction Tests
+# =============================================================================
+
+class TestTextContent:
+    """Tests for collecting an element's descendant text."""
+
+    def test_text_in_document_order(self, merger):
+        """Nested text nodes are joined depth-first, left to right."""
+        node = {"nodeType": 1, "children": [
+            {"nodeType": 3, "nodeValue": " Hello "},
+            {"nodeType": 1, "children": [
+                {"nodeType": 3, "nodeValue": "big"},
+                {"nodeType": 3, "nodeValue": "   "},
+            ]},
+            {"nodeType": 3, "nodeValue": "world"},
+        ]}
+
+        assert merger._extract_text_content(node) == "Hello big world"
+
+    def test_deep_tree_does_not_recurse(self, merger):
+        """Trees deeper than the recursion limit are handled."""
+        node = leaf = {"nodeType": 1, "children": []}
+        for _ in range(5000):
+            leaf["children"] = [{"nodeType": 1, "children": []}]
+            leaf = leaf["children"][0]
+        leaf["children"] = [{"nodeType": 3, "nodeValue": "deep"}]
+
+        assert merger._extract_text_content(node) == "deep"
+
+
+# =============================================================================
+# AX Lookup Tests
+# =============================================================================
+
+class TestAXLookup:
+    """Tests for the backend_node_id -> accessibility data table."""
+
+    def test_precomputes_focusable_and_disabled(self, merger):
+        """Focusable/disabled flags are lifted out of the properties list."""
+        lookup = merger._build_ax_lookup({"nodes": [{
+            "backendDOMNodeId": 7,
+            "role": {"value": "Button"},
+            "name": {"value": "OK"},
+            "properties": [
+                {"name": "focusable", "value": {"value": True}},
+                {"name": "disabled", "value": {"value": True}},
+            ],
+        }]})
+
+        assert lookup[7]["role"] == "Button"
+        assert lookup[7]["role_lower"] == "button"
+        assert lookup[7]["focusable"] is True
+        assert lookup[7]["disabled"] is True
+        assert lookup[7]["properties"] == {"focusable": True, "disabled": True}
+
+    def test_missing_values_default_to_empty(self, merger):
+        """Nodes without role, name or property values still get an entry."""
+        lookup = merger._build_ax_lookup({"nodes": [{
+            "backendDOMNodeId": 8,
+            "properties": [{"name": "focusable", "value": {}}, {"name": "hidden"}],
+        }]})
+
+        assert lookup[8]["role"] == ""
+        assert lookup[8]["name"] == ""
+        assert lookup[8]["properties"] == {}
+        assert lookup[8]["focusable"] is False
+
+
+# =============================================================================
+# Visibility Tests
+# =============================================================================
+
+class TestVisibility:
+    """Tests for style-based visibility checks."""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("1", 1.0), ("0", 0.0), ("0.05", 0.05), ("0.5", 0.5), ("bogus", 1.0), ("", 1.0),
+    ])
+    def test_parse_opacity(self, value, expected):
+        """Opacity strings parse to floats; garbage counts as opaque."""
+        assert _parse_opacity(value) == expected
+
+    def test_transparent_element_is_hidden(self, merger):
+        """Elements with opacity below 0.1 are not visible."""
+        assert not merger._is_element_visible([0, 0, 50, 50], {"opacity": "0.05"})
+        assert merger._is_element_visible([0, 0, 50, 50], {"opacity": "0.5"})
+
+    @pytest.mark.parametrize("styles, expected", [
+        ({}, True),
+        ({"display": "none"}, False),
+        ({"visibility": "hidden"}, False),
+        ({"opacity": "0"}, False),
+        ({"display": "inline", "visibility": "visible", "opacity": "0.2"}, True),
+    ])
+    def test_style_visibility(self, merger, styles, expected):
+        """The style check matches _is_element_visible for on-screen bounds."""
+        assert merger._is_style_visible(styles) is expected
+        assert merger._is_element_visible([0, 0, 50, 50], styles) is expected
+
+
+# =============================================================================
+# Classification Tests
+# =============================================================================
+
+class TestClassifyInteraction:
+    """Tests for the fused interactive/clickable classifier."""
+
+    def test_pointer_cursor_alone_is_interactive_not_clickable(self, merger):
+        """A styled div is interactive but lacks the structural signals to be clickable."""
+        assert merger._classify_interaction("div", {}, "", False, False, {"cursor": "pointer"}) == (True, False)
+
+    def test_event_handler_attribute_makes_element_clickable(self, merger):
+        """Inline event handlers mark plain elements as interactive and clickable."""
+        assert merger._classify_interaction("div", {"onclick": "go()"}, "", False, False, {}) == (True, True)
+        assert merger._classify_interaction("div", {"onfocus": "go()"}, "", False, False, {}) == (False, False)
+
+    def test_disabled_button_is_not_clickable(self, merger):
+        """Disabled controls stay interactive but are not clickable."""
+        assert merger._classify_interaction("button", {"disabled": ""}, "button", False, False, {}) == (True, False)
+
+    def test_pointer_events_none_blocks_both(self, merger):
+        """pointer-events: none disables both interaction and clicking."""
+        assert merger._classify_interaction("a", {}, "link", False, False, {"pointer-events": "none"}) == (False, False)
+
+    def test_ax_disabled_blocks_clicking(self, merger):
+        """The AX disabled flag makes a focusable element unclickable."""
+        assert merger._classify_interaction("div", {}, "", True, True, {}) == (True, False)
+
+    def test_input_clickability_follows_type(self, merger):
+        """Text inputs are interactive but not clickable; checkboxes are both."""
+        assert merger._classify_interaction("input", {"type": "text"}, "textbox", False, False, {}) == (True, False)
+        assert merger._classify_interaction("input", {"type": "checkbox"}, "checkbox", False, False, {}) == (True, True)
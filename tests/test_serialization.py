@@ -0,0 +1,111 @@
+"""
+Tests for serialize_dom (no Chrome required).
+
+Run with: pytest tests/test_serialization.py -v
+"""
+from browser_agent.core.serialization import serialize_dom
+from browser_agent.utils.merger import EnhancedNode
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def make_node(**overrides) -> EnhancedNode:
+    """Build a minimal actionable EnhancedNode."""
+    fields = dict(
+        backend_node_id=42,
+        tag_name="a",
+        bounds_css=(10.0, 20.0, 100.0, 30.0),
+        click_point=(60.0, 35.0),
+        attributes={"href": "/docs", "class": "nav"},
+        text_content="Docs",
+        ax_role="link",
+        ax_name="Docs",
+        ax_properties={},
+        is_visible=True,
+        is_interactive=True,
+        is_clickable=True,
+        is_focusable=True,
+        is_occluded=False,
+        computed_styles={},
+        paint_order=1,
+        action_type="click",
+        confidence_score=0.9,
+    )
+    fields.update(overrides)
+    return EnhancedNode(**fields)
+
+
+# =============================================================================
+# Serialization Tests
+# =============================================================================
+
+class TestSerializeDom:
+    """Tests for the text lines and selector map."""
+
+    def test_line_format(self):
+        """Each node becomes one indexed line with allowlisted attributes."""
+        output = serialize_dom([make_node()])
+
+        assert output.lines == ['[1] <a class="nav" href="/docs"> | action=click | conf=0.90 | name="Docs" | focusable']
+        assert output.selector_map[1].backend_node_id == 42
+
+    def test_empty_and_unlisted_attributes_are_omitted(self):
+        """Only non-empty allowlisted attributes appear in the tag."""
+        output = serialize_dom([
+            make_node(attributes={}),
+            make_node(backend_node_id=43, attributes={"data-x": "1", "id": "", "title": "Help"}),
+        ])
+
+        assert output.lines[0].startswith("[1] <a> |")
+        assert output.lines[1].startswith('[2] <a title="Help"> |')
+
+    def test_long_values_are_truncated(self):
+        """Text and attribute values longer than max_text_length get an ellipsis."""
+        output = serialize_dom([make_node(attributes={"title": "  abcdefghij  "}, ax_name="x" * 12)], max_text_length=8)
+
+        assert '<a title="abcde...">' in output.lines[0]
+        assert 'name="xxxxx..."' in output.lines[0]
+
+    def test_optional_fields(self):
+        """Distinct text and unclickable click targets are flagged; duplicate text is not."""
+        output = serialize_dom([
+            make_node(text_content="  Read the docs ", is_focusable=False, is_clickable=False),
+            make_node(backend_node_id=43, text_content="Docs", attributes={}),
+        ])
+
+        assert output.lines[0].endswith('| name="Docs" | text="Read the docs" | not-clickable')
+        assert output.lines[1] == '[2] <a> | action=click | conf=0.90 | name="Docs" | focusable'
+
+    def test_selector_entries_use_slots(self):
+        """Selector entries carry no per-instance __dict__."""
+        entry = serialize_dom([make_node()]).selector_map[1]
+
+        assert not hasattr(entry, "__dict__")
+        assert entry.click_point == (60.0, 35.0)
+
+    def test_selector_attributes_are_a_snapshot(self):
+        """Entries copy the node's attributes, so later node changes don't leak in."""
+        node = make_node()
+        entry = serialize_dom([node]).selector_map[1]
+
+        node.attributes["href"] = "/other"
+
+        assert entry.attributes == {"href": "/docs", "class": "nav"}
+        assert type(entry.attributes) is dict
+
+    def test_text_is_joined_once(self):
+        """The joined text is computed on first access and then reused."""
+        output = serialize_dom([make_node(), make_node(backend_node_id=43)])
+
+        assert output.text == "\n".join(output.lines)
+        assert output.text is output.text
+
+    def test_truncates_after_max_lines(self):
+        """Nodes beyond max_lines are summarised in a trailer line."""
+        nodes = [make_node(backend_node_id=i) for i in range(5)]
+
+        output = serialize_dom(nodes, max_lines=2)
+
+        assert len(output.selector_map) == 2
+        assert output.lines[-1] == "... truncated 3 additional elements"